@@ -8,29 +8,33 @@ Powered by Google Gemini AI
 import os
 import sys
 import asyncio
-from datetime import datetime
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.prompt import Prompt
-from rich.markdown import Markdown
+import functools
+import signal
+import string
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+# Rich is imported where it is used so that fast paths such as --version
+# do not pay for loading it
+if TYPE_CHECKING:
+    from rich.panel import Panel
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent / "src"))
 
+# Checked once per process; main() loads it before the CLI starts
+_ENV_FILE = Path(".env")
+_ENV_FILE_EXISTS = _ENV_FILE.is_file()
 
-class AISChatCLI:
-    """Unified CLI interface for chatting with different LLMs about AIS generation"""
-    
-    def __init__(self):
-        self.console = Console()
-        self.llm_client = None
-        self.llm_type = None
-        
-    def print_banner(self):
-        """Print welcome banner"""
-        banner_text = """
+
+@functools.cache
+def _has_gemini_key() -> bool:
+    """Whether GEMINI_KEY is set (read once, after .env has been loaded)"""
+    return bool(os.environ.get("GEMINI_KEY"))
+
+
+BANNER_TEXT = """
 # 🚢 AIS Ship Data Generator - Gemini AI Powered
 
 **Chat with Google Gemini AI to generate realistic maritime AIS data!**
@@ -46,51 +50,12 @@ Type your requests in natural language like:
 Type 'help' for more examples, 'quit' to exit.
 
 🔑 **Setup:** Set your GEMINI_KEY environment variable to get started!
-        """
-        
-        self.console.print(Panel(
-            Markdown(banner_text),
-            title="🌊 Maritime AI Assistant",
-            border_style="green"
-        ))
-    
-    def detect_gemini_key(self) -> bool:
-        """Check if Gemini API key is available"""
-        return bool(os.getenv("GEMINI_KEY"))
-    
-    def check_setup(self) -> bool:
-        """Check if Gemini is properly configured"""
-        if not self.detect_gemini_key():
-            self.console.print("\n❌ **GEMINI_KEY not found!**", style="red")
-            self.console.print("")
-            self.console.print("🔧 **Setup Instructions:**", style="yellow")
-            self.console.print("1. Get a free API key from https://aistudio.google.com/app/apikey")
-            self.console.print("2. Set environment variable: export GEMINI_KEY='your-api-key-here'")
-            self.console.print("3. Or add to .env file: GEMINI_KEY=your-api-key-here")
-            self.console.print("")
-            return False
-        return True
-    
-    async def initialize_gemini(self):
-        """Initialize the Gemini AI client"""
-        self.llm_type = "gemini"
-        
-        try:
-            from src.llm_integration.gemini_client import AISGeminiClient
-            self.console.print("🌟 Initializing Google Gemini AI assistant...", style="yellow")
-            self.llm_client = AISGeminiClient()
-            self.console.print("✅ Google Gemini AI assistant ready! 🌟", style="green")
-            return True
-            
-        except Exception as e:
-            self.console.print(f"❌ Failed to initialize Gemini: {e}", style="red")
-            self.console.print("💡 Make sure your GEMINI_KEY is valid and you have internet connection", style="yellow")
-            return False
-    
-    def show_help(self):
-        """Show help information"""
-        help_text = """
-# 🚢 AIS Generator Commands & Examples - Google Gemini AI
+⚙️ **Optional:** AIS_GEMINI_MAX_CONCURRENCY sets how many Gemini requests may run at once (default 8)
+"""
+
+# Parsed once; only the assistant name is substituted per llm_type
+HELP_TEMPLATE = string.Template("""
+# 🚢 AIS Generator Commands & Examples - $LLM_NAME AI
 
 ## **Example Natural Language Requests:**
 
@@ -132,14 +97,165 @@ Type 'help' for more examples, 'quit' to exit.
 • NMEA format data for marine systems
 • Individual ship files for detailed analysis
 
-**Powered by:** Google Gemini AI - Advanced natural language understanding
-        """
+**Powered by:** $LLM_NAME AI - Advanced natural language understanding
+""")
+
+
+@functools.lru_cache(maxsize=None)
+def _banner_panel() -> "Panel":
+    """Build the welcome banner panel once; the Markdown never changes"""
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    
+    return Panel(
+        Markdown(BANNER_TEXT),
+        title="🌊 Maritime AI Assistant",
+        border_style="green"
+    )
+
+
+def _llm_display_name(llm_type: str) -> str:
+    """Human-readable assistant name for an llm_type"""
+    return LLM_DISPLAY_NAMES.get(llm_type, llm_type.title())
+
+
+def _help_text(llm_type: str) -> str:
+    """Fill in the help template for an llm_type"""
+    return HELP_TEMPLATE.substitute(LLM_NAME=_llm_display_name(llm_type))
+
+
+@functools.lru_cache(maxsize=4)
+def _help_panel(llm_type: str) -> "Panel":
+    """Build the help panel once per llm_type"""
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    
+    return Panel(
+        Markdown(_help_text(llm_type)),
+        title=f"🌟 {_llm_display_name(llm_type)} AI Help & Examples",
+        border_style="cyan"
+    )
+
+
+def _create_gemini_client():
+    """Create the Google Gemini client (imported lazily; it pulls in the SDK)"""
+    from src.llm_integration.gemini_client import AISGeminiClient
+    return AISGeminiClient()
+
+
+# AI backends the CLI can drive, keyed by llm_type
+LLM_FACTORIES = {
+    "gemini": _create_gemini_client,
+}
+
+LLM_DISPLAY_NAMES = {
+    "gemini": "Google Gemini",
+}
+
+
+class _PlainPrinter:
+    """Minimal stand-in for a Rich Console when stdout is not a terminal"""
+    
+    def print(self, *objects, **kwargs):
+        sys.stdout.write(" ".join(str(obj) for obj in objects) + "\n")
+
+
+class AISChatCLI:
+    """Unified CLI interface for chatting with different LLMs about AIS generation"""
+    
+    # Requests arriving within this window of each other are handled by one task
+    BATCH_WINDOW_SECONDS = 0.02
+    MAX_BATCH_SIZE = 8
+    # Minimum time between writes of a streaming response in plain mode
+    STREAM_RENDER_INTERVAL = 0.05
+    
+    def __init__(self, llm_type: str = "gemini"):
+        if llm_type not in LLM_FACTORIES:
+            raise ValueError(f"Unknown llm_type '{llm_type}'. Choose from: {', '.join(LLM_FACTORIES)}")
+        
+        # When piped or redirected, skip Rich rendering and write raw text
+        self._plain = not sys.stdout.isatty()
+        if self._plain:
+            self.console = _PlainPrinter()
+        else:
+            from rich.console import Console
+            self.console = Console()
+        self.llm_client = None
+        self.llm_type = llm_type
+        self.llm_name = _llm_display_name(llm_type)
+        
+        # Optional client methods, resolved once when the client is created
+        self._process = None
+        self._stream = None
+        self._clear = None
+        self._caps = None
+        self._close = None
+        self._pending: List[asyncio.Task] = []
+        self._inbox: Optional[asyncio.Queue] = None
+        self._caps_task: Optional[asyncio.Task] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._prompt_future: Optional[asyncio.Future] = None
         
-        self.console.print(Panel(
-            Markdown(help_text),
-            title="🌟 Gemini AI Help & Examples",
-            border_style="cyan"
-        ))
+    def print_banner(self):
+        """Print welcome banner"""
+        self.console.print(BANNER_TEXT if self._plain else _banner_panel())
+    
+    def detect_gemini_key(self) -> bool:
+        """Check if Gemini API key is available"""
+        return _has_gemini_key()
+    
+    def check_setup(self) -> bool:
+        """Check if Gemini is properly configured"""
+        if not self.detect_gemini_key():
+            from rich.panel import Panel
+            from rich.text import Text
+            
+            # Render the whole message in one print call
+            message = Text()
+            message.append("❌ GEMINI_KEY not found!\n\n", style="bold red")
+            message.append("🔧 Setup Instructions:\n", style="bold yellow")
+            message.append("1. Get a free API key from https://aistudio.google.com/app/apikey\n")
+            message.append("2. Set environment variable: export GEMINI_KEY='your-api-key-here'\n")
+            message.append("3. Or add to .env file: GEMINI_KEY=your-api-key-here")
+            
+            self.console.print(message if self._plain else Panel(message, border_style="red"))
+            return False
+        return True
+    
+    def _bind_client_methods(self):
+        """Look up the optional client methods once instead of on every call"""
+        self._process = getattr(self.llm_client, 'process_request', None)
+        self._stream = getattr(self.llm_client, 'stream_request', None)
+        self._clear = getattr(self.llm_client, 'clear_conversation', None)
+        self._caps = getattr(self.llm_client, 'get_available_capabilities', None)
+        self._close = getattr(self.llm_client, 'close', None)
+    
+    async def initialize_llm(self):
+        """Initialize the AI client for the configured llm_type"""
+        try:
+            factory = LLM_FACTORIES[self.llm_type]
+            self.console.print(f"🌟 Initializing {self.llm_name} AI assistant...", style="yellow")
+            self.llm_client = factory()
+            self._bind_client_methods()
+            
+            # Fetch capabilities while the user reads the intro so the first
+            # 'caps' command does not wait on the client
+            if self._caps:
+                self._caps_task = asyncio.create_task(self._caps())
+            self.console.print(f"✅ {self.llm_name} AI assistant ready! 🌟", style="green")
+            return True
+            
+        except Exception as e:
+            self.console.print(f"❌ Failed to initialize {self.llm_name}: {e}", style="red")
+            self.console.print("💡 Make sure your GEMINI_KEY is valid and you have internet connection", style="yellow")
+            return False
+    
+    def show_help(self):
+        """Show help information"""
+        if self._plain:
+            self.console.print(_help_text(self.llm_type))
+        else:
+            self.console.print(_help_panel(self.llm_type))
     
     async def show_capabilities(self):
         """Show AI capabilities"""
@@ -148,51 +264,71 @@ Type 'help' for more examples, 'quit' to exit.
             return
         
         try:
-            if hasattr(self.llm_client, 'get_available_capabilities'):
-                capabilities = await self.llm_client.get_available_capabilities()
+            if self._caps_task is not None:
+                try:
+                    capabilities = await self._caps_task
+                except Exception:
+                    # Let the next 'caps' retry instead of replaying the failure
+                    self._caps_task = None
+                    raise
+            elif self._caps:
+                capabilities = await self._caps()
             else:
                 capabilities = "🚢 **AIS Ship Data Generator**\n\nGenerate realistic maritime AIS data with multiple ship types and routes in the Irish Sea region."
             
-            self.console.print(Panel(
-                Markdown(capabilities),
-                title="🌟 Gemini AI Capabilities",
-                border_style="green"
-            ))
+            self.console.print(self._wrap_markdown(capabilities, f"🌟 {self.llm_name} AI Capabilities", "green"))
         except Exception as e:
             self.console.print(f"❌ Error getting capabilities: {e}", style="red")
     
     def clear_conversation(self):
         """Clear conversation history"""
-        if self.llm_client and hasattr(self.llm_client, 'clear_conversation'):
-            self.llm_client.clear_conversation()
+        if self._clear:
+            self._clear()
             self.console.print("🧹 Conversation history cleared", style="cyan")
         else:
             self.console.print("❌ AI not initialized or doesn't support conversation clearing", style="red")
     
+    def show_demo_notice(self):
+        """Explain that demo mode is gone"""
+        # Demo functionality removed - Gemini only mode
+        self.console.print("🎯 Demo mode has been removed. Just describe what you want to generate!", style="yellow")
+        self.console.print("Example: 'Generate 3 ships near Southampton'", style="cyan")
+    
+    # Special commands, resolved with a single dict lookup per input
+    _EXIT_COMMANDS = frozenset({'quit', 'exit', 'q'})
+    _SYNC_COMMANDS = {
+        'help': show_help,
+        'h': show_help,
+        'clear': clear_conversation,
+        'cls': clear_conversation,
+        'demo': show_demo_notice,
+        'test': show_demo_notice,
+    }
+    _ASYNC_COMMANDS = {
+        'caps': show_capabilities,
+        'capabilities': show_capabilities,
+    }
     
     async def process_user_input(self, user_input: str) -> bool:
         """Process user input and return False if should exit"""
         
-        user_input_lower = user_input.strip().lower()
+        command = user_input.strip().lower()
         
         # Handle special commands
-        if user_input_lower in ['quit', 'exit', 'q']:
-            return False
-        elif user_input_lower in ['help', 'h']:
-            self.show_help()
-            return True
-        elif user_input_lower in ['clear', 'cls']:
-            self.clear_conversation()
+        if not command:
             return True
-        elif user_input_lower in ['caps', 'capabilities']:
-            await self.show_capabilities()
-            return True
-        elif user_input_lower in ['demo', 'test']:
-            # Demo functionality removed - Gemini only mode
-            self.console.print("🎯 Demo mode has been removed. Just describe what you want to generate!", style="yellow")
-            self.console.print("Example: 'Generate 3 ships near Southampton'", style="cyan")
+        if command in self._EXIT_COMMANDS:
+            return False
+        handler = self._SYNC_COMMANDS.get(command)
+        if handler is not None:
+            # Let earlier requests finish first so e.g. 'clear' also drops their turns
+            await self.drain_pending()
+            handler(self)
             return True
-        elif user_input_lower == '':
+        handler = self._ASYNC_COMMANDS.get(command)
+        if handler is not None:
+            await self.drain_pending()
+            await handler(self)
             return True
         
         # Process with AI
@@ -200,37 +336,192 @@ Type 'help' for more examples, 'quit' to exit.
             self.console.print("❌ AI not initialized", style="red")
             return True
         
-        try:
-            self.console.print(f"🌟 Google Gemini is thinking...", style="yellow")
+        self.console.print(f"🌟 {self.llm_name} is thinking...", style="yellow")
+        
+        # Hand the request to the background batcher so the user can keep typing
+        self._start_batcher()
+        self._inbox.put_nowait(user_input)
+        
+        return True
+    
+    def _start_batcher(self):
+        """Create the request queue and start the batcher if they are not running"""
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        if self._batcher is None or self._batcher.done():
+            self._batcher = asyncio.create_task(self._batch_requests())
+    
+    async def _batch_requests(self):
+        """Collect requests arriving close together and handle them as one task
+        
+        Each batch runs as its own task and waits for the previous one to
+        finish before sending anything, so the client sees the turns of the
+        conversation one at a time and responses appear in submission order.
+        """
+        while True:
+            batch = [await self._inbox.get()]
+            try:
+                await asyncio.sleep(self.BATCH_WINDOW_SECONDS)
+                while len(batch) < self.MAX_BATCH_SIZE:
+                    try:
+                        batch.append(self._inbox.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                previous = self._pending[-1] if self._pending else None
+                task = asyncio.create_task(self._respond(batch, previous))
+                self._pending.append(task)
+                task.add_done_callback(self._pending.remove)
+            finally:
+                for _ in batch:
+                    self._inbox.task_done()
+    
+    async def _request(self, user_input: str) -> str:
+        """Send a single request to the AI client"""
+        if self._process:
+            return await self._process(user_input)
+        return f"Sorry, {self.llm_type} doesn't support this request type."
+    
+    def _wrap_markdown(self, text: str, title: str, border_style: str):
+        """Wrap Markdown text in a titled Panel, or return it as-is in plain mode"""
+        if self._plain:
+            return text
+        
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+        
+        return Panel(Markdown(text), title=title, border_style=border_style)
+    
+    def _wrap_response(self, response: str):
+        """Wrap an AI response for display"""
+        return self._wrap_markdown(response, f"🌟 {self.llm_name} AI Assistant", "green")
+    
+    async def _respond(self, batch: List[str], previous: Optional[asyncio.Task]):
+        """Get the AI responses for a batch of requests and print them in order
+        
+        The requests are turns of one conversation with a stateful client, so
+        they are sent one after another rather than concurrently.
+        """
+        # The client keeps the conversation history, so a request may depend
+        # on the previous turn being recorded before it is sent
+        if previous is not None:
+            await asyncio.wait([previous])
+        
+        for user_input in batch:
+            if self._stream:
+                await self._stream_response(user_input)
+                continue
             
-            if hasattr(self.llm_client, 'process_request'):
-                response = await self.llm_client.process_request(user_input)
-            else:
-                response = f"Sorry, {self.llm_type} doesn't support this request type."
+            try:
+                response = await self._request(user_input)
+            except Exception as e:
+                self.console.print(f"❌ Error: {e}", style="red")
+                continue
             
             # Display response in a panel
-            self.console.print(Panel(
-                Markdown(response),
-                title="🌟 Gemini AI Assistant",
-                border_style="green"
-            ))
-            
-        except Exception as e:
-            self.console.print(f"❌ Error: {e}", style="red")
+            self.console.print(self._wrap_response(response))
+    
+    async def _stream_response(self, user_input: str):
+        """Collect a response as it streams in from the AI client
         
-        return True
+        The input prompt is already active while the reply streams, so Rich
+        output is printed as one panel once the stream ends instead of
+        redrawing a Live region over the prompt.
+        """
+        chunks: List[str] = []
+        
+        async def consume():
+            async for chunk in self._stream(user_input):
+                chunks.append(chunk)
+        
+        producer = asyncio.create_task(consume())
+        
+        try:
+            if self._plain:
+                await self._write_stream(producer, chunks)
+            else:
+                await asyncio.wait([producer])
+        finally:
+            # Stop reading the stream if this response was cancelled
+            producer.cancel()
+        
+        if not producer.cancelled() and producer.exception() is not None:
+            self.console.print(f"❌ Error: {producer.exception()}", style="red")
+        elif not self._plain:
+            self.console.print(self._wrap_response("".join(chunks)))
+    
+    async def _write_stream(self, producer: asyncio.Task, chunks: List[str]):
+        """Write streamed chunks straight to stdout as they arrive"""
+        written = 0
+        while True:
+            finished = producer.done()
+            if len(chunks) > written:
+                sys.stdout.write("".join(chunks[written:]))
+                sys.stdout.flush()
+                written = len(chunks)
+            if finished:
+                break
+            await asyncio.wait([producer], timeout=self.STREAM_RENDER_INTERVAL)
+        sys.stdout.write("\n")
+    
+    async def drain_pending(self):
+        """Wait for any queued or in-flight AI requests to finish printing"""
+        if self._inbox is not None:
+            await self._inbox.join()
+        if self._pending:
+            await asyncio.wait(list(self._pending))
+    
+    async def ask_user(self, label: str) -> str:
+        """Read a line of user input on a background thread
+        
+        A daemon thread is used rather than the default executor so that an
+        unanswered prompt never keeps the interpreter alive on exit.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._prompt_future = future
+        
+        def deliver(result=None, error=None):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        
+        def read():
+            try:
+                if self._plain:
+                    answer = input(f"{label}: ")
+                else:
+                    from rich.prompt import Prompt
+                    answer = Prompt.ask(f"[bold green]{label}[/bold green]", default="", console=self.console)
+            except BaseException as e:  # EOFError / KeyboardInterrupt go back to the loop
+                loop.call_soon_threadsafe(deliver, None, e)
+            else:
+                loop.call_soon_threadsafe(deliver, answer)
+        
+        threading.Thread(target=read, name="ais-chat-input", daemon=True).start()
+        return await future
     
     async def run_chat_loop(self):
         """Main chat loop"""
-        self.console.print(f"\n🗣️  **Start chatting with Google Gemini!** Type your request or 'help' for examples.\n")
+        self.console.print(f"\n🗣️  **Start chatting with {self.llm_name}!** Type your request or 'help' for examples.\n")
+        
+        self._start_batcher()
+        
+        # Ctrl-C cancels in-flight requests instead of waiting for them
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._on_interrupt)
+            handling_sigint = True
+        except (NotImplementedError, RuntimeError):
+            handling_sigint = False  # e.g. Windows: KeyboardInterrupt still applies
         
         while True:
             try:
-                # Get user input
-                user_input = Prompt.ask(
-                    "[bold green]You[/bold green]",
-                    default=""
-                )
+                # Get user input without blocking the event loop
+                user_input = await self.ask_user("You")
                 
                 # Process input
                 should_continue = await self.process_user_input(user_input)
@@ -245,6 +536,30 @@ Type 'help' for more examples, 'quit' to exit.
             except EOFError:
                 self.console.print("\n👋 Goodbye!", style="yellow")
                 break
+        
+        try:
+            await self.drain_pending()
+        finally:
+            if handling_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
+            self._batcher.cancel()
+    
+    def _on_interrupt(self):
+        """Handle Ctrl-C: cancel outstanding AI requests, or leave if idle"""
+        if self._pending or not self._inbox.empty():
+            # Drop queued requests and restart the batcher so any batch it
+            # is still collecting is discarded too
+            while not self._inbox.empty():
+                self._inbox.get_nowait()
+                self._inbox.task_done()
+            self._batcher.cancel()
+            self._batcher = asyncio.create_task(self._batch_requests())
+            
+            for task in list(self._pending):
+                task.cancel()
+            self.console.print("\n⛔ Cancelled pending AI requests", style="yellow")
+        elif self._prompt_future is not None and not self._prompt_future.done():
+            self._prompt_future.set_exception(KeyboardInterrupt())
     
     async def run(self):
         """Main entry point"""
@@ -255,31 +570,40 @@ Type 'help' for more examples, 'quit' to exit.
             return
         
         # Initialize Gemini
-        if not await self.initialize_gemini():
+        if not await self.initialize_llm():
             return
         
         # Show quick intro
-        self.console.print(Panel(
-            "💡 **Quick Start:** Try saying 'Generate a convoy off Sicily' or 'What can you do?'",
-            border_style="blue"
-        ))
+        quick_start = "💡 **Quick Start:** Try saying 'Generate a convoy off Sicily' or 'What can you do?'"
+        if self._plain:
+            self.console.print(quick_start)
+        else:
+            from rich.panel import Panel
+            self.console.print(Panel(quick_start, border_style="blue"))
         
         # Run chat loop
-        await self.run_chat_loop()
+        try:
+            await self.run_chat_loop()
+        finally:
+            if self._close:
+                self._close()
+        
+        from rich.text import Text
         
-        self.console.print(f"\n🌊 Thank you for using the AIS Generator with Google Gemini!", style="green")
-        self.console.print("📁 Check the ./output/ directory for generated files")
-        self.console.print("🗺️  Interactive maps are automatically generated for each scenario!")
+        farewell = Text()
+        farewell.append(f"\n🌊 Thank you for using the AIS Generator with {self.llm_name}!\n", style="green")
+        farewell.append("📁 Check the ./output/ directory for generated files\n")
+        farewell.append("🗺️  Interactive maps are automatically generated for each scenario!")
+        self.console.print(farewell)
 
 
 async def main():
     """Main function"""
     # Load environment variables from .env file if it exists
-    env_file = Path(".env")
-    if env_file.exists():
+    if _ENV_FILE_EXISTS:
         try:
             from dotenv import load_dotenv
-            load_dotenv()
+            load_dotenv(_ENV_FILE)
         except ImportError:
             pass  # python-dotenv not installed, that's okay
     
@@ -289,8 +613,27 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Answer informational flags before loading Rich or the AI client
+    if "--version" in sys.argv[1:]:
+        from src import __version__
+        print(f"ais_chat {__version__}")
+        sys.exit(0)
+    if {"-h", "--help"} & set(sys.argv[1:]):
+        print(__doc__.strip())
+        print("\nUsage: python ais_chat.py [--version]")
+        sys.exit(0)
+    
+    # uvloop is an optional, faster drop-in event loop on POSIX
+    run = asyncio.run
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            run = uvloop.run
+        except ImportError:
+            pass  # uvloop not installed, the default loop is fine
+    
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
     except Exception as e:
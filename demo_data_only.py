@@ -6,6 +6,7 @@ Generates AIS data using working APIs - no visualization
 
 import sys
 import os
+import inspect
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
@@ -14,6 +15,8 @@ from rich.panel import Panel
 sys.path.append(str(Path(__file__).parent / "src"))
 
 console = Console()
+# File names and sizes need no markup parsing or highlighting
+plain_console = Console(highlight=False, markup=False, emoji=False)
 
 def generate_demo_data():
     """Generate demo data using the working multi-ship generator"""
@@ -39,29 +42,22 @@ def generate_demo_data():
         
         # Check if the method exists and call it
         if hasattr(generator, 'generate_irish_sea_scenario'):
-            # Try without duration_hours first to see expected parameters
+            # Pass only the optional parameters this generator version accepts
+            scenario_method = generator.generate_irish_sea_scenario
+            parameters = inspect.signature(scenario_method).parameters
+            kwargs = {"num_ships": 3}
+            if "report_interval_minutes" in parameters:
+                kwargs["report_interval_minutes"] = 5
+            if "scenario_name" in parameters:
+                kwargs["scenario_name"] = "demo_data_test"
+            
             try:
-                result = generator.generate_irish_sea_scenario(
-                    num_ships=3,
-                    report_interval_minutes=5,
-                    scenario_name="demo_data_test"
-                )
-                console.print("✅ Generated scenario without duration_hours")
+                result = scenario_method(**kwargs)
+                console.print(f"✅ Generated scenario with parameters: {', '.join(kwargs)}")
                 console.print(f"📊 Result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
                 
             except Exception as e:
                 console.print(f"❌ Error: {e}")
-                
-                # Try with different parameters
-                try:
-                    result = generator.generate_irish_sea_scenario(
-                        num_ships=3,
-                        scenario_name="demo_data_test_2"
-                    )
-                    console.print("✅ Generated scenario with minimal parameters")
-                    
-                except Exception as e2:
-                    console.print(f"❌ Second attempt failed: {e2}")
         else:
             console.print("❌ Method generate_irish_sea_scenario not found")
         
@@ -91,14 +87,16 @@ def generate_demo_data():
         # Show what files were created
         output_dir = Path("output")
         if output_dir.exists():
-            json_files = list(output_dir.glob("*.json"))
-            console.print(f"\n📁 Found {len(json_files)} JSON files in output/")
+            # DirEntry caches its stat result, so each file is stat'ed once
+            with os.scandir(output_dir) as entries:
+                json_files = [entry for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+            plain_console.print(f"\n📁 Found {len(json_files)} JSON files in output/")
             
             if json_files:
-                console.print("📄 Latest files:")
-                for file_path in sorted(json_files, key=lambda f: f.stat().st_mtime)[-3:]:
-                    size = file_path.stat().st_size
-                    console.print(f"  • {file_path.name} ({size} bytes)")
+                plain_console.print("📄 Latest files:")
+                json_files.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in json_files[-3:]:
+                    plain_console.print(f"  • {entry.name} ({entry.stat().st_size} bytes)")
         
     except Exception as e:
         console.print(f"❌ Generation failed: {e}")
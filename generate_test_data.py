@@ -16,12 +16,13 @@ sys.path.append(str(Path(__file__).parent / "src"))
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 
 class AISDataGenerator:
     """Test script focused purely on data generation"""
     
+    __slots__ = ('console', 'generated_files')
+    
     def __init__(self):
         self.console = Console()
         self.generated_files = []
@@ -37,6 +38,7 @@ class AISDataGenerator:
         try:
             from src.generators.ais_generator import AISGenerator
             from src.core.file_output import FileOutputManager
+            from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
             
             # Create generator
             generator = AISGenerator()
@@ -204,30 +206,33 @@ class AISDataGenerator:
             self.console.print("⚠️  No files were generated")
             return
         
-        # Check which files actually exist
+        # Stat each file once; a missing file just drops out
         existing_files = []
         for file_path in self.generated_files:
-            if Path(file_path).exists():
-                existing_files.append(file_path)
+            try:
+                existing_files.append((file_path, os.stat(file_path).st_size))
+            except FileNotFoundError:
+                pass
         
         if not existing_files:
             self.console.print("⚠️  Generated files not found (may be in output/ directory)")
             
             # Check output directory
-            output_dir = Path("output")
-            if output_dir.exists():
-                json_files = list(output_dir.glob("*.json"))
-                if json_files:
-                    self.console.print(f"\n📁 Found {len(json_files)} files in output/ directory:")
-                    for file_path in json_files[-5:]:  # Show last 5
-                        size = file_path.stat().st_size
-                        modified = datetime.fromtimestamp(file_path.stat().st_mtime)
-                        self.console.print(f"  📄 {file_path.name} ({size} bytes, {modified.strftime('%H:%M:%S')})")
+            try:
+                with os.scandir("output") as entries:
+                    json_files = [entry for entry in entries if entry.name.endswith(".json")]
+            except FileNotFoundError:
+                json_files = []
+            if json_files:
+                self.console.print(f"\n📁 Found {len(json_files)} files in output/ directory:")
+                for entry in json_files[-5:]:  # Show last 5
+                    stat = entry.stat()
+                    modified = datetime.fromtimestamp(stat.st_mtime)
+                    self.console.print(f"  📄 {entry.name} ({stat.st_size} bytes, {modified.strftime('%H:%M:%S')})")
             return
         
         self.console.print(f"✅ Successfully generated {len(existing_files)} files:")
-        for file_path in existing_files:
-            size = Path(file_path).stat().st_size if Path(file_path).exists() else 0
+        for file_path, size in existing_files:
             self.console.print(f"  📄 {file_path} ({size} bytes)")
     
     async def run_generation_tests(self):
@@ -239,7 +244,8 @@ class AISDataGenerator:
             style="bold green"
         ))
         
-        # Generate data for each phase
+        # Run the phases one after another so their console output and the
+        # crawl progress bar don't interleave
         self.generate_crawl_data()
         self.generate_walk_data()
         await self.generate_llm_data()
@@ -1,156 +1,277 @@
 #!/usr/bin/env python3
 """
 Multi-Ship AIS Data Map Viewer - Walk Version
-Visualize multiple ships on an interactive map using Folium
+Visualize multiple ships on an interactive Leaflet map (optionally built with Folium)
 """
 
 import os
 import json
-import folium
-import webbrowser
+import operator
+import string
 from datetime import datetime
 from pathlib import Path
 import sys
 import random
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Files at least this large are streamed instead of parsed in one go
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+
+# Relative map paths are resolved against the directory the viewer was started in
+MAP_OUTPUT_DIR = Path.cwd()
+
+# Per-report fields the map actually reads
+MAP_REPORT_FIELDS = ('position', 'timestamp', 'speed_knots', 'navigation_status', 'ship_name', 'ship_type')
+
+# (lat, lon) out of a report's position dict in one C-level call
+_GET_LATLON = operator.itemgetter('latitude', 'longitude')
+
 
 def find_latest_multi_ship_file(output_dir="output"):
     """Find the most recent multi-ship JSON file"""
-    output_path = Path(output_dir)
-    
-    if not output_path.exists():
+    # One directory pass; DirEntry.stat() is cached so each file is stat'ed once
+    multi_files = []
+    json_files = []
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".json"):
+                    continue
+                item = (entry.stat(follow_symlinks=False).st_mtime, entry.path)
+                json_files.append(item)
+                if "ships" in name or "multi_ship" in name:
+                    multi_files.append(item)
+    except FileNotFoundError:
         print(f"❌ Output directory '{output_dir}' does not exist")
         return None
     
     # Look for multi-ship files first
-    multi_files = list(output_path.glob("*multi_ship*.json")) + list(output_path.glob("*ships*.json"))
-    
     if multi_files:
-        latest_file = max(multi_files, key=lambda f: f.stat().st_mtime)
-        return latest_file
+        return Path(max(multi_files)[1])
     
     # Fallback to any JSON file
-    json_files = list(output_path.glob("*.json"))
     if not json_files:
         print(f"❌ No JSON files found in '{output_dir}'")
         return None
     
-    latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
-    return latest_file
+    return Path(max(json_files)[1])
+
+
+def _stream_multi_ship_data(json_file):
+    """Stream a large multi-ship file one ship at a time, keeping only map fields"""
+    with open(json_file, 'rb') as f:
+        metadata = next(ijson.items(f, 'metadata', use_float=True), {})
+    
+    ships = {}
+    with open(json_file, 'rb') as f:
+        for mmsi, ship in ijson.kvitems(f, 'ships', use_float=True):
+            if isinstance(ship, dict):
+                ship['ais_data'] = [
+                    {key: report[key] for key in MAP_REPORT_FIELDS if key in report}
+                    for report in ship.get('ais_data', [])
+                ]
+            ships[mmsi] = ship
+    
+    return {'metadata': metadata, 'ships': ships} if ships else None
+
+
+def _fast_loads(json_file):
+    """Parse a whole JSON file with the fastest available backend"""
+    # Unbuffered readall sizes one read from fstat; the bytes go to the parser undecoded
+    with open(json_file, 'rb', buffering=0) as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
 
 def load_multi_ship_data(json_file):
     """Load multi-ship AIS data from JSON file"""
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        return data
+        size = os.stat(json_file).st_size
+        
+        if IJSON_AVAILABLE and size >= STREAM_THRESHOLD_BYTES:
+            data = _stream_multi_ship_data(json_file)
+            if data:
+                return data
+        
+        return _fast_loads(json_file)
     except Exception as e:
         print(f"❌ Error loading JSON file: {e}")
         return None
 
 
-def get_ship_color(ship_type: str, ship_index: int) -> str:
-    """Get color for ship based on type"""
-    color_map = {
-        'PASSENGER': 'blue',
-        'CARGO': 'green',
-        'FISHING': 'orange', 
-        'PILOT_VESSEL': 'red',
-        'HIGH_SPEED_CRAFT': 'purple',
-        'LAW_ENFORCEMENT': 'darkred',
-        'SEARCH_RESCUE': 'cadetblue',
-    }
-    
-    # Fallback color sequence if type not found
-    fallback_colors = ['blue', 'red', 'green', 'purple', 'orange', 'darkred', 'lightred', 'beige', 'darkblue', 'darkgreen']
-    
-    return color_map.get(ship_type, fallback_colors[ship_index % len(fallback_colors)])
+SHIP_COLOR_MAP = {
+    'PASSENGER': 'blue',
+    'CARGO': 'green',
+    'FISHING': 'orange', 
+    'PILOT_VESSEL': 'red',
+    'HIGH_SPEED_CRAFT': 'purple',
+    'LAW_ENFORCEMENT': 'darkred',
+    'SEARCH_RESCUE': 'cadetblue',
+}
 
+# Fallback color sequence if type not found
+FALLBACK_COLORS = ('blue', 'red', 'green', 'purple', 'orange', 'darkred', 'lightred', 'beige', 'darkblue', 'darkgreen')
 
-def get_ship_icon(ship_type: str) -> str:
-    """Get icon for ship based on type"""
-    icon_map = {
-        'PASSENGER': 'ship',
-        'CARGO': 'cube', 
-        'FISHING': 'anchor',
-        'PILOT_VESSEL': 'shield',
-        'HIGH_SPEED_CRAFT': 'forward',
-        'LAW_ENFORCEMENT': 'star',
-        'SEARCH_RESCUE': 'plus',
-    }
-    
-    return icon_map.get(ship_type, 'ship')
+SHIP_ICON_MAP = {
+    'PASSENGER': 'ship',
+    'CARGO': 'cube', 
+    'FISHING': 'anchor',
+    'PILOT_VESSEL': 'shield',
+    'HIGH_SPEED_CRAFT': 'forward',
+    'LAW_ENFORCEMENT': 'star',
+    'SEARCH_RESCUE': 'plus',
+}
 
 
-def create_multi_ship_map(multi_ship_data, save_path="multi_ship_map.html"):
-    """Create interactive map with multiple ships"""
-    
-    if not multi_ship_data:
-        print("❌ Invalid multi-ship data format")
-        return None
-    
-    # Handle different data formats
-    if 'ships' in multi_ship_data:
-        # Multi-ship format
-        ships_data = multi_ship_data['ships']
-        metadata = multi_ship_data.get('metadata', {})
-    else:
-        # Single ship format - convert to multi-ship
-        ships_data = {'single_ship': multi_ship_data}
-        metadata = multi_ship_data.get('metadata', {})
-    
-    if not ships_data:
-        print("❌ No ship data found")
-        return None
-    
-    # Calculate map center from all ships
-    all_lats = []
-    all_lons = []
-    
-    for ship_mmsi, ship_info in ships_data.items():
-        if isinstance(ship_info, dict) and 'ais_data' in ship_info:
-            ais_data = ship_info['ais_data']
-        else:
-            # Handle direct list format
-            ais_data = ship_info if isinstance(ship_info, list) else []
-            
-        for pos_data in ais_data:
-            if 'position' in pos_data:
-                all_lats.append(pos_data['position']['latitude'])
-                all_lons.append(pos_data['position']['longitude'])
-    
-    if not all_lats:
-        print("❌ No position data found in any ship")
-        return None
-    
-    center_lat = sum(all_lats) / len(all_lats)
-    center_lon = sum(all_lons) / len(all_lons)
-    
-    # Create map
-    m = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=8,
-        tiles='OpenStreetMap'
-    )
-    
-    # Add title
-    total_ships = len(ships_data)
-    scenario_name = metadata.get('scenario_name', 'Multi-Ship Scenario')
-    generated_at = metadata.get('generated_at', 'Unknown time')
-    
-    title_html = f'''
+# Popup and title HTML, filled with str.format_map once per marker.
+# ISO timestamps are cut to seconds by the {:.19s} format spec, not by slicing
+TITLE_TEMPLATE = """
     <h3 align="center" style="font-size:20px"><b>🚢 Multi-Ship AIS Visualization</b></h3>
     <p align="center">
         <b>Scenario:</b> {scenario_name}<br>
         <b>Ships:</b> {total_ships}<br>
-        <b>Generated:</b> {generated_at[:19] if generated_at != 'Unknown time' else generated_at}<br>
+        <b>Generated:</b> {generated_at:.19s}<br>
         <b>Walk Version - Hackathon 2025</b>
     </p>
+    """
+
+START_POPUP_TEMPLATE = """
+        <b>🟢 START: {name}</b><br>
+        <b>MMSI:</b> {mmsi}<br>
+        <b>Type:</b> {type}<br>
+        <b>Time:</b> {time:.19s}<br>
+        <b>Position:</b> {lat:.6f}, {lon:.6f}<br>
+        <b>Speed:</b> {speed} knots
+        """
+
+END_POPUP_TEMPLATE = """
+        <b>🔴 CURRENT: {name}</b><br>
+        <b>MMSI:</b> {mmsi}<br>
+        <b>Type:</b> {type}<br>
+        <b>Time:</b> {time:.19s}<br>
+        <b>Position:</b> {lat:.6f}, {lon:.6f}<br>
+        <b>Speed:</b> {speed} knots<br>
+        <b>Status:</b> {status}
+        """
+
+
+LEGEND_HTML = '''
+    <div style="position: fixed; 
+                bottom: 50px; right: 50px; width: 200px; height: 120px; 
+                background-color: white; border:2px solid grey; z-index:9999; 
+                font-size:14px; padding: 10px">
+    <h4>Ship Types</h4>
+    <p><i style="color:blue">●</i> Passenger<br>
+       <i style="color:green">●</i> Cargo<br>
+       <i style="color:orange">●</i> Fishing<br>
+       <i style="color:red">●</i> Pilot<br>
+       <i style="color:purple">●</i> High Speed</p>
+    </div>
     '''
-    m.get_root().html.add_child(folium.Element(title_html))
+
+# Standalone Leaflet page: every ship layer arrives as one GeoJSON FeatureCollection
+LEAFLET_PAGE_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Multi-Ship AIS Visualization</title>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.css"/>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.2.0/css/all.min.css"/>
+    <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.js"></script>
+    <style>
+        html, body { width: 100%; height: 100%; margin: 0; padding: 0; }
+        #map { position: relative; width: 100%; height: 100%; }
+    </style>
+</head>
+<body>
+$title_html
+$legend_html
+<div id="map"></div>
+<script>
+    var map = L.map("map").setView([$center_lat, $center_lon], 8);
+    L.tileLayer("https://tile.openstreetmap.org/{z}/{x}/{y}.png", {
+        maxZoom: 19,
+        attribution: "&copy; OpenStreetMap contributors"
+    }).addTo(map);
     
-    # Add each ship to the map
+    L.geoJSON($features, {
+        style: function (feature) { return feature.properties.style; },
+        pointToLayer: function (feature, latlng) {
+            var props = feature.properties;
+            if (props.kind === "waypoint") {
+                return L.circleMarker(latlng, {radius: 5, color: props.color, fillColor: props.color, fillOpacity: 0.7});
+            }
+            return L.marker(latlng, {
+                icon: L.AwesomeMarkers.icon({icon: props.icon, markerColor: props.color, prefix: "fa"})
+            });
+        },
+        onEachFeature: function (feature, layer) {
+            layer.bindPopup(feature.properties.popup, {maxWidth: 300});
+            if (feature.properties.tooltip) {
+                layer.bindTooltip(feature.properties.tooltip);
+            }
+        }
+    }).addTo(map);
+    $fit_bounds
+</script>
+</body>
+</html>
+""")
+
+
+def get_ship_color(ship_type: str, ship_index: int) -> str:
+    """Get color for ship based on type"""
+    color = SHIP_COLOR_MAP.get(ship_type)
+    if color is None:
+        color = FALLBACK_COLORS[ship_index % len(FALLBACK_COLORS)]
+    return color
+
+
+def get_ship_icon(ship_type: str) -> str:
+    """Get icon for ship based on type"""
+    return SHIP_ICON_MAP.get(ship_type, 'ship')
+
+
+def _ship_ais_data(ship_info):
+    """Return the position reports for either ship layout"""
+    if isinstance(ship_info, dict):
+        return ship_info.get('ais_data', [])
+    # Handle direct list format
+    return ship_info if isinstance(ship_info, list) else []
+
+
+def _popup_fields(ship_name, ship_mmsi, ship_type, pos_data, location):
+    """Collect the values a start/end popup template needs"""
+    return {
+        'name': ship_name,
+        'mmsi': ship_mmsi,
+        'type': ship_type,
+        'time': pos_data.get('timestamp', 'Unknown'),
+        'lat': location[0],
+        'lon': location[1],
+        'speed': pos_data.get('speed_knots', 'N/A'),
+        'status': pos_data.get('navigation_status', 'N/A'),
+    }
+
+
+def _collect_ship_layers(ships_data, coords, ship_spans):
+    """Work out each ship's track, markers and popups, independent of the renderer"""
+    layers = []
     ship_index = 0
     for ship_mmsi, ship_info in ships_data.items():
         
@@ -159,122 +280,261 @@ def create_multi_ship_map(multi_ship_data, save_path="multi_ship_map.html"):
             ship_name = ship_info['ship_info'].get('ship_name', f'Ship {ship_mmsi}')
             ship_type = ship_info['ship_info'].get('ship_type', 'UNKNOWN')
             ais_data = ship_info.get('ais_data', [])
-            route_summary = ship_info.get('route_summary', {})
         else:
             # Handle direct list or different format
             if isinstance(ship_info, list) and ship_info:
                 ais_data = ship_info
                 ship_name = ais_data[0].get('ship_name', f'Ship {ship_mmsi}')
                 ship_type = ais_data[0].get('ship_type', 'UNKNOWN')
-                route_summary = {}
             else:
                 continue
         
         if not ais_data:
             continue
         
-        # Get ship color and icon
-        ship_color = get_ship_color(ship_type, ship_index)
-        ship_icon = get_ship_icon(ship_type)
-        
-        # Extract path coordinates
-        path_coords = []
-        for pos in ais_data:
-            if 'position' in pos:
-                lat = pos['position']['latitude']
-                lon = pos['position']['longitude']
-                path_coords.append([lat, lon])
+        # Path coordinates are this ship's slice of the shared array
+        start, end = ship_spans.get(ship_mmsi, (0, 0))
+        path_coords = coords[start:end]
         
-        if not path_coords:
+        if not len(path_coords):
             continue
         
+        start_location = path_coords[0].tolist()
+        end_location = path_coords[-1].tolist()
+        
+        # A few intermediate points for longer routes, read from the path slice
+        path_len = len(path_coords)
+        mid_points = []
+        if path_len > 4:
+            mid_indices = (path_len // 4, path_len // 2, 3 * path_len // 4)
+            mid_points = list(zip(mid_indices, path_coords[list(mid_indices)].tolist()))
+        
+        layers.append({
+            'name': ship_name,
+            'type': ship_type,
+            'color': get_ship_color(ship_type, ship_index),
+            'icon': get_ship_icon(ship_type),
+            'path': path_coords,
+            'start_location': start_location,
+            'start_popup': START_POPUP_TEMPLATE.format_map(
+                _popup_fields(ship_name, ship_mmsi, ship_type, ais_data[0], start_location)
+            ),
+            'end_location': end_location,
+            'end_popup': END_POPUP_TEMPLATE.format_map(
+                _popup_fields(ship_name, ship_mmsi, ship_type, ais_data[-1], end_location)
+            ),
+            'mid_points': mid_points,
+        })
+        ship_index += 1
+    
+    return layers
+
+
+def _point_feature(location, properties):
+    """GeoJSON Point feature for a (lat, lon) location"""
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [location[1], location[0]]},
+        'properties': properties,
+    }
+
+
+def _layer_features(layer):
+    """GeoJSON features for one ship: track, start/end markers and waypoints"""
+    name = layer['name']
+    color = layer['color']
+    
+    # GeoJSON wants [lon, lat]; orjson serializes the (C-contiguous) array directly
+    lonlat = layer['path'][:, ::-1].copy()
+    track = {
+        'type': 'Feature',
+        'geometry': {
+            'type': 'LineString',
+            'coordinates': lonlat if ORJSON_AVAILABLE else lonlat.tolist(),
+        },
+        'properties': {
+            'popup': f"{name} ({layer['type']})",
+            'style': {'color': color, 'weight': 3, 'opacity': 0.8},
+        },
+    }
+    start = _point_feature(layer['start_location'], {
+        'kind': 'marker',
+        'popup': layer['start_popup'],
+        'tooltip': f"START: {name}",
+        'color': 'green',
+        'icon': 'play',
+    })
+    end = _point_feature(layer['end_location'], {
+        'kind': 'marker',
+        'popup': layer['end_popup'],
+        'tooltip': f"CURRENT: {name}",
+        'color': color,
+        'icon': layer['icon'],
+    })
+    waypoints = [
+        _point_feature(location, {'kind': 'waypoint', 'popup': f"{name} - Point {mid_idx+1}", 'color': color})
+        for mid_idx, location in layer['mid_points']
+    ]
+    return [track, start, end, *waypoints]
+
+
+def _render_leaflet_html(layers, center, bounds, title_html):
+    """Render the map page directly: one GeoJSON FeatureCollection in a Leaflet template"""
+    features = [feature for layer in layers for feature in _layer_features(layer)]
+    
+    collection = {'type': 'FeatureCollection', 'features': features}
+    if ORJSON_AVAILABLE:
+        features_json = orjson.dumps(collection, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    else:
+        features_json = json.dumps(collection, ensure_ascii=False)
+    
+    fit_bounds = ""
+    if bounds is not None:
+        fit_bounds = f"map.fitBounds({json.dumps(bounds)}, {{padding: [20, 20]}});"
+    
+    return LEAFLET_PAGE_TEMPLATE.substitute(
+        title_html=title_html,
+        legend_html=LEGEND_HTML,
+        center_lat=center[0],
+        center_lon=center[1],
+        # Keep "</" inside popup HTML from closing the script element
+        features=features_json.replace("</", "<\\/"),
+        fit_bounds=fit_bounds,
+    )
+
+
+def _render_folium_map(layers, center, bounds, title_html, save_path):
+    """Render the map through folium (the original renderer)"""
+    import folium
+    
+    m = folium.Map(
+        location=center,
+        zoom_start=8,
+        tiles='OpenStreetMap'
+    )
+    m.get_root().html.add_child(folium.Element(title_html))
+    
+    for layer in layers:
+        ship_color = layer['color']
+        
+        # Collect this ship's layers in one group and attach it to the map once
+        ship_group = folium.FeatureGroup(name=f"{layer['name']} ({layer['type']})")
+        
         # Draw ship's path
         folium.PolyLine(
-            path_coords,
+            layer['path'].tolist(),
             color=ship_color,
             weight=3,
             opacity=0.8,
-            popup=f"{ship_name} ({ship_type})"
-        ).add_to(m)
+            popup=f"{layer['name']} ({layer['type']})"
+        ).add_to(ship_group)
         
         # Add start marker
-        start_pos = ais_data[0]
-        start_popup = f"""
-        <b>🟢 START: {ship_name}</b><br>
-        <b>MMSI:</b> {ship_mmsi}<br>
-        <b>Type:</b> {ship_type}<br>
-        <b>Time:</b> {start_pos.get('timestamp', 'Unknown')[:19]}<br>
-        <b>Position:</b> {start_pos['position']['latitude']:.6f}, {start_pos['position']['longitude']:.6f}<br>
-        <b>Speed:</b> {start_pos.get('speed_knots', 'N/A')} knots
-        """
-        
         folium.Marker(
-            location=[start_pos['position']['latitude'], start_pos['position']['longitude']],
-            popup=folium.Popup(start_popup, max_width=300),
-            tooltip=f"START: {ship_name}",
+            location=layer['start_location'],
+            popup=folium.Popup(layer['start_popup'], max_width=300),
+            tooltip=f"START: {layer['name']}",
             icon=folium.Icon(color='green', icon='play', prefix='fa')
-        ).add_to(m)
-        
-        # Add end marker  
-        end_pos = ais_data[-1]
-        end_popup = f"""
-        <b>🔴 CURRENT: {ship_name}</b><br>
-        <b>MMSI:</b> {ship_mmsi}<br>
-        <b>Type:</b> {ship_type}<br>
-        <b>Time:</b> {end_pos.get('timestamp', 'Unknown')[:19]}<br>
-        <b>Position:</b> {end_pos['position']['latitude']:.6f}, {end_pos['position']['longitude']:.6f}<br>
-        <b>Speed:</b> {end_pos.get('speed_knots', 'N/A')} knots<br>
-        <b>Status:</b> {end_pos.get('navigation_status', 'N/A')}
-        """
+        ).add_to(ship_group)
         
+        # Add end marker
         folium.Marker(
-            location=[end_pos['position']['latitude'], end_pos['position']['longitude']],
-            popup=folium.Popup(end_popup, max_width=300),
-            tooltip=f"CURRENT: {ship_name}",
-            icon=folium.Icon(color=ship_color, icon=ship_icon, prefix='fa')
-        ).add_to(m)
+            location=layer['end_location'],
+            popup=folium.Popup(layer['end_popup'], max_width=300),
+            tooltip=f"CURRENT: {layer['name']}",
+            icon=folium.Icon(color=ship_color, icon=layer['icon'], prefix='fa')
+        ).add_to(ship_group)
         
-        # Add a few intermediate points for longer routes
-        if len(ais_data) > 4:
-            mid_points = [len(ais_data)//4, len(ais_data)//2, 3*len(ais_data)//4]
-            for i, mid_idx in enumerate(mid_points):
-                if mid_idx < len(ais_data):
-                    mid_pos = ais_data[mid_idx]
-                    folium.CircleMarker(
-                        location=[mid_pos['position']['latitude'], mid_pos['position']['longitude']],
-                        radius=5,
-                        popup=f"{ship_name} - Point {mid_idx+1}",
-                        color=ship_color,
-                        fillColor=ship_color,
-                        fillOpacity=0.7
-                    ).add_to(m)
+        for mid_idx, mid_location in layer['mid_points']:
+            folium.CircleMarker(
+                location=mid_location,
+                radius=5,
+                popup=f"{layer['name']} - Point {mid_idx+1}",
+                color=ship_color,
+                fillColor=ship_color,
+                fillOpacity=0.7
+            ).add_to(ship_group)
         
-        ship_index += 1
+        ship_group.add_to(m)
     
-    # Add legend
-    legend_html = '''
-    <div style="position: fixed; 
-                bottom: 50px; right: 50px; width: 200px; height: 120px; 
-                background-color: white; border:2px solid grey; z-index:9999; 
-                font-size:14px; padding: 10px">
-    <h4>Ship Types</h4>
-    <p><i style="color:blue">●</i> Passenger<br>
-       <i style="color:green">●</i> Cargo<br>
-       <i style="color:orange">●</i> Fishing<br>
-       <i style="color:red">●</i> Pilot<br>
-       <i style="color:purple">●</i> High Speed</p>
-    </div>
-    '''
-    m.get_root().html.add_child(folium.Element(legend_html))
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML))
     
     # Fit bounds to show all ships
-    if len(all_lats) > 1:
-        bounds = [[min(all_lats), min(all_lons)], [max(all_lats), max(all_lons)]]
+    if bounds is not None:
         m.fit_bounds(bounds, padding=(20, 20))
     
+    m.save(save_path)
+
+
+def create_multi_ship_map(multi_ship_data, save_path="multi_ship_map.html", use_folium=False):
+    """Create interactive map with multiple ships
+    
+    The page is written directly as Leaflet HTML; pass use_folium=True to build it
+    through folium instead.
+    """
+    import numpy as np
+    
+    if not multi_ship_data:
+        print("❌ Invalid multi-ship data format")
+        return None
+    
+    # Handle different data formats
+    if 'ships' in multi_ship_data:
+        # Multi-ship format
+        ships_data = multi_ship_data['ships']
+        metadata = multi_ship_data.get('metadata', {})
+    else:
+        # Single ship format - convert to multi-ship
+        ships_data = {'single_ship': multi_ship_data}
+        metadata = multi_ship_data.get('metadata', {})
+    
+    if not ships_data:
+        print("❌ No ship data found")
+        return None
+    
+    # Gather every position into one (N, 2) array; each ship's path is a slice of it
+    ship_spans = {}
+    
+    def iter_positions():
+        count = 0
+        for ship_mmsi, ship_info in ships_data.items():
+            start = count
+            for pos_data in _ship_ais_data(ship_info):
+                if 'position' in pos_data:
+                    count += 1
+                    yield _GET_LATLON(pos_data['position'])
+            ship_spans[ship_mmsi] = (start, count)
+    
+    coords = np.fromiter(iter_positions(), dtype=np.dtype((np.float64, 2)))
+    
+    if not len(coords):
+        print("❌ No position data found in any ship")
+        return None
+    
+    center = coords.mean(axis=0).tolist()
+    bounds = [coords.min(axis=0).tolist(), coords.max(axis=0).tolist()] if len(coords) > 1 else None
+    
+    # Title
+    total_ships = len(ships_data)
+    scenario_name = metadata.get('scenario_name', 'Multi-Ship Scenario')
+    generated_at = metadata.get('generated_at', 'Unknown time')
+    
+    title_html = TITLE_TEMPLATE.format(
+        scenario_name=scenario_name,
+        total_ships=total_ships,
+        generated_at=generated_at,
+    )
+    
+    layers = _collect_ship_layers(ships_data, coords, ship_spans)
+    
     # Save map
     try:
-        m.save(save_path)
+        if use_folium:
+            _render_folium_map(layers, center, bounds, title_html, save_path)
+        else:
+            html = _render_leaflet_html(layers, center, bounds, title_html)
+            with open(save_path, 'w', encoding='utf-8') as f:
+                f.write(html)
         print(f"✅ Multi-ship map saved to: {save_path}")
         return save_path
     except Exception as e:
@@ -284,9 +544,14 @@ def create_multi_ship_map(multi_ship_data, save_path="multi_ship_map.html"):
 
 def open_map(map_path):
     """Open the map in the default web browser"""
+    import webbrowser
+    
     try:
-        abs_path = os.path.abspath(map_path)
-        file_url = f"file://{abs_path}"
+        map_file = Path(map_path)
+        if not map_file.is_absolute():
+            map_file = MAP_OUTPUT_DIR / map_file
+        # as_uri() also percent-encodes spaces and other unsafe characters
+        file_url = map_file.as_uri()
         
         print(f"🌐 Opening multi-ship map in browser: {file_url}")
         webbrowser.open(file_url)
@@ -6,43 +6,251 @@ Visualize generated AIS/NMEA data on an interactive map using Folium
 
 import os
 import json
+import mmap
+import operator
+import string
 import folium
+import numpy as np
+from folium.plugins import FastMarkerCluster
 import webbrowser
 from datetime import datetime
 from pathlib import Path
 import sys
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Files at least this large are memory-mapped instead of read into a bytes copy
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+# Report -> position dict -> (lat, lon), each a single C-level call
+_GET_POSITION = operator.itemgetter('position')
+_GET_LATLON = operator.itemgetter('latitude', 'longitude')
+
+# Above this many reports, interior positions go into one clustered canvas layer
+FAST_CLUSTER_THRESHOLD = 50
+
+# Above this many reports, write the page straight from a Leaflet template instead of folium
+DIRECT_HTML_THRESHOLD = 1000
+
+# Tracks longer than this are simplified before drawing the polyline
+SIMPLIFY_MIN_POINTS = 200
+# Maximum deviation (degrees, roughly 10 m) a dropped vertex may have from the drawn line
+SIMPLIFY_EPSILON = 1e-4
+
+# Leaflet page for long tracks: the track is embedded once as a JSON array
+TRACK_PAGE_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AIS Track Visualization</title>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.css"/>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.2.0/css/all.min.css"/>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.css"/>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.Default.css"/>
+    <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.js"></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/leaflet.markercluster.js"></script>
+    <style>
+        html, body { width: 100%; height: 100%; margin: 0; padding: 0; }
+        #map { position: relative; width: 100%; height: 100%; }
+    </style>
+</head>
+<body>
+$title_html
+<div id="map"></div>
+<script>
+    var track = $track;
+    var map = L.map("map").setView([$center_lat, $center_lon], 10);
+    L.tileLayer("https://tile.openstreetmap.org/{z}/{x}/{y}.png", {
+        maxZoom: 19,
+        attribution: "&copy; OpenStreetMap contributors"
+    }).addTo(map);
+    
+    L.polyline($path, {color: "blue", weight: 3, opacity: 0.8}).bindPopup($track_popup).addTo(map);
+    
+    var cluster = L.markerClusterGroup();
+    for (var i = 1; i < track.length - 1; i++) {
+        cluster.addLayer(L.marker(track[i]));
+    }
+    map.addLayer(cluster);
+    
+    L.marker(track[0], {icon: L.AwesomeMarkers.icon({icon: "play", markerColor: "green", prefix: "fa"})})
+        .bindPopup($start_popup, {maxWidth: 300}).bindTooltip($start_tooltip).addTo(map);
+    L.marker(track[track.length - 1], {icon: L.AwesomeMarkers.icon({icon: "stop", markerColor: "red", prefix: "fa"})})
+        .bindPopup($end_popup, {maxWidth: 300}).bindTooltip($end_tooltip).addTo(map);
+    
+    map.fitBounds($bounds);
+</script>
+</body>
+</html>
+""")
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
 
 def find_latest_json_file(output_dir="output"):
     """Find the most recent JSON file in the output directory"""
-    output_path = Path(output_dir)
-    
-    if not output_path.exists():
+    # One directory pass; DirEntry.stat() is cached so each file is stat'ed once
+    try:
+        with os.scandir(output_dir) as entries:
+            latest = max(
+                (entry for entry in entries if entry.name.endswith(".json")),
+                key=lambda entry: entry.stat().st_mtime,
+                default=None,
+            )
+    except FileNotFoundError:
         print(f"❌ Output directory '{output_dir}' does not exist")
         return None
     
-    json_files = list(output_path.glob("*.json"))
-    
-    if not json_files:
+    if latest is None:
         print(f"❌ No JSON files found in '{output_dir}'")
         return None
     
-    # Sort by modification time, newest first
-    latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
-    return latest_file
+    return Path(latest.path)
+
+
+def _parse_json_bytes(buffer):
+    """Parse a bytes-like JSON buffer with the fastest available backend"""
+    if SIMDJSON_AVAILABLE:
+        # Lazy document: only the fields create_map touches become Python objects.
+        # A fresh parser per file keeps earlier documents valid.
+        return simdjson.Parser().parse(buffer)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(buffer)
+    return json.loads(bytes(buffer))
 
 
 def load_ais_data(json_file):
     """Load AIS data from JSON file"""
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        return data
+        with open(json_file, 'rb') as f:
+            # Large files are parsed straight out of the page cache; both fast
+            # parsers copy what they keep, so the mapping can close right after
+            if (SIMDJSON_AVAILABLE or ORJSON_AVAILABLE) and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    return _parse_json_bytes(view)
+            
+            # Parse the raw bytes so the parser can skip the str decode
+            return _parse_json_bytes(f.read())
     except Exception as e:
         print(f"❌ Error loading JSON file: {e}")
         return None
 
 
+# Popup HTML: the ship header is rendered once per map, the body once per marker
+POPUP_HEADER_TEMPLATE = """
+        <b>🚢 {ship_name}</b><br>
+        <b>MMSI:</b> {mmsi}<br>"""
+
+POPUP_BODY_TEMPLATE = """
+        <b>Time:</b> {timestamp}<br>
+        <b>Position:</b> {lat:.6f}, {lon:.6f}<br>
+        <b>Speed:</b> {speed} knots<br>
+        <b>Course:</b> {course}°<br>
+        <b>Status:</b> {status}<br>
+        <b>Report:</b> {report}/{total_reports}
+        """
+
+
+def _position_popup(popup_header, pos, i, lat, lon, total_reports):
+    """Build the popup HTML for one position report"""
+    # Format timestamp
+    timestamp = pos.get('timestamp', 'Unknown')
+    if 'T' in timestamp:
+        timestamp = timestamp.replace('T', ' ')[:19]
+    
+    return popup_header + POPUP_BODY_TEMPLATE.format(
+        timestamp=timestamp,
+        lat=lat,
+        lon=lon,
+        speed=pos.get('speed_knots', 'N/A'),
+        course=pos.get('course_degrees', 'N/A'),
+        status=pos.get('navigation_status', 'N/A'),
+        report=i + 1,
+        total_reports=total_reports,
+    )
+
+
+def _simplify_track(coords, epsilon=SIMPLIFY_EPSILON):
+    """Ramer-Douglas-Peucker: keep only the vertices that move the line by more than epsilon"""
+    n = len(coords)
+    if n < SIMPLIFY_MIN_POINTS:
+        return coords
+    
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    
+    # Iterative rather than recursive, so long straight runs can't hit the recursion limit
+    segments = [(0, n - 1)]
+    while segments:
+        first, last = segments.pop()
+        if last - first < 2:
+            continue
+        
+        origin = coords[first]
+        chord = coords[last] - origin
+        offsets = coords[first + 1:last] - origin
+        chord_len = np.hypot(chord[0], chord[1])
+        if chord_len == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            # Perpendicular distance of every interior point from the chord in one vector op
+            distances = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / chord_len
+        
+        farthest = int(distances.argmax())
+        if distances[farthest] > epsilon:
+            split = first + 1 + farthest
+            keep[split] = True
+            segments.append((first, split))
+            segments.append((split, last))
+    
+    return coords[keep]
+
+
+def _js_literal(value):
+    """Encode a value for embedding inside the page's <script> block"""
+    encoded = orjson.dumps(value).decode() if ORJSON_AVAILABLE else json.dumps(value, ensure_ascii=False)
+    # Keep "</" inside popup HTML from closing the script element
+    return encoded.replace("</", "<\\/")
+
+
+def _write_track_html(save_path, positions, coords, center, title_html, ship_name, popup_header, total_reports):
+    """Write a long track straight to a Leaflet page, without building a folium tree"""
+    last = len(positions) - 1
+    start_lat, start_lon = coords[0].tolist()
+    end_lat, end_lon = coords[last].tolist()
+    start_popup = "🟢 <b>START</b><br>" + _position_popup(
+        popup_header, positions[0], 0, start_lat, start_lon, total_reports)
+    end_popup = "🔴 <b>END</b><br>" + _position_popup(
+        popup_header, positions[last], last, end_lat, end_lon, total_reports)
+    
+    html = TRACK_PAGE_TEMPLATE.substitute(
+        title_html=title_html,
+        track=_js_literal(coords.tolist()),
+        path=_js_literal(_simplify_track(coords).tolist()),
+        center_lat=center[0],
+        center_lon=center[1],
+        track_popup=_js_literal(f"Ship Track: {ship_name}"),
+        start_popup=_js_literal(start_popup),
+        start_tooltip=_js_literal(f"{ship_name} - Report 1"),
+        end_popup=_js_literal(end_popup),
+        end_tooltip=_js_literal(f"{ship_name} - Report {last + 1}"),
+        bounds=_js_literal([coords.min(axis=0).tolist(), coords.max(axis=0).tolist()]),
+    )
+    with open(save_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
 def create_map(ais_data, save_path="ais_map.html"):
     """Create interactive map from AIS data"""
     
@@ -58,6 +266,24 @@ def create_map(ais_data, save_path="ais_map.html"):
         print("❌ No position data found")
         return None
     
+    # One pass over the reports collects the track coordinates
+    latlon = list(map(_GET_LATLON, map(_GET_POSITION, positions)))
+    
+    # All track coordinates as one contiguous (N, 2) array
+    coords = np.array(latlon, dtype=np.float64)
+    
+    # Marker indices: start, every stride-th intermediate point, end.
+    # Long tracks cluster their interior points, so only start/end become markers
+    last = len(positions) - 1
+    show_interior = len(positions) <= FAST_CLUSTER_THRESHOLD
+    marker_indices = [0]
+    if show_interior:
+        # Intermediate points: show only every few points to avoid clutter
+        stride = max(1, len(positions) // 10) if len(positions) > 10 else 1
+        marker_indices.extend(range(stride, last, stride))
+    if last:
+        marker_indices.append(last)
+    
     # Calculate map center (middle of route)
     if route_summary:
         start_pos = route_summary.get('start_position', {})
@@ -68,18 +294,9 @@ def create_map(ais_data, save_path="ais_map.html"):
             center_lon = (start_pos['longitude'] + end_pos['longitude']) / 2
         else:
             # Fallback to first position
-            center_lat = positions[0]['position']['latitude']
-            center_lon = positions[0]['position']['longitude']
+            center_lat, center_lon = coords[0].tolist()
     else:
-        center_lat = positions[0]['position']['latitude']
-        center_lon = positions[0]['position']['longitude']
-    
-    # Create map
-    m = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=10,
-        tiles='OpenStreetMap'
-    )
+        center_lat, center_lon = coords[0].tolist()
     
     # Add title
     ship_name = metadata.get('ship_name', 'Unknown Ship')
@@ -96,59 +313,59 @@ def create_map(ais_data, save_path="ais_map.html"):
         <b>Hackathon 2025</b>
     </p>
     '''
-    m.get_root().html.add_child(folium.Element(title_html))
     
-    # Extract coordinates for the ship's path
-    path_coords = []
-    for pos in positions:
-        lat = pos['position']['latitude']
-        lon = pos['position']['longitude']
-        path_coords.append([lat, lon])
+    popup_header = POPUP_HEADER_TEMPLATE.format(ship_name=ship_name, mmsi=mmsi)
+    
+    # Long tracks skip folium entirely
+    if len(positions) > DIRECT_HTML_THRESHOLD:
+        try:
+            _write_track_html(save_path, positions, coords, (center_lat, center_lon),
+                              title_html, ship_name, popup_header, total_reports)
+            print(f"✅ Map saved to: {save_path}")
+            return save_path
+        except Exception as e:
+            print(f"❌ Error saving map: {e}")
+            return None
+    
+    # Create map
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=10,
+        tiles='OpenStreetMap'
+    )
+    m.get_root().html.add_child(folium.Element(title_html))
     
     # Draw ship's path
     folium.PolyLine(
-        path_coords,
+        _simplify_track(coords).tolist(),
         color='blue',
         weight=3,
         opacity=0.8,
         popup=f"Ship Track: {ship_name}"
     ).add_to(m)
     
+    # Long tracks: cluster the interior points and keep full markers for start/end only
+    if not show_interior:
+        FastMarkerCluster(data=coords[1:-1].tolist(), name="Track positions").add_to(m)
+    
     # Add markers for start, intermediate points, and end
-    for i, pos in enumerate(positions):
-        lat = pos['position']['latitude']
-        lon = pos['position']['longitude']
-        
-        # Format timestamp
-        timestamp = pos.get('timestamp', 'Unknown')
-        if 'T' in timestamp:
-            timestamp = timestamp.replace('T', ' ')[:19]
+    for i in marker_indices:
+        pos = positions[i]
+        lat, lon = latlon[i]
         
         # Create popup content
-        popup_content = f"""
-        <b>🚢 {ship_name}</b><br>
-        <b>MMSI:</b> {mmsi}<br>
-        <b>Time:</b> {timestamp}<br>
-        <b>Position:</b> {lat:.6f}, {lon:.6f}<br>
-        <b>Speed:</b> {pos.get('speed_knots', 'N/A')} knots<br>
-        <b>Course:</b> {pos.get('course_degrees', 'N/A')}°<br>
-        <b>Status:</b> {pos.get('navigation_status', 'N/A')}<br>
-        <b>Report:</b> {i+1}/{total_reports}
-        """
+        popup_content = _position_popup(popup_header, pos, i, lat, lon, total_reports)
         
         # Different icons for different points
         if i == 0:
             # Start point
             icon = folium.Icon(color='green', icon='play', prefix='fa')
             popup_content = f"🟢 <b>START</b><br>" + popup_content
-        elif i == len(positions) - 1:
+        elif i == last:
             # End point
             icon = folium.Icon(color='red', icon='stop', prefix='fa')
             popup_content = f"🔴 <b>END</b><br>" + popup_content
         else:
-            # Intermediate points (show only every few points to avoid clutter)
-            if len(positions) > 10 and i % max(1, len(positions) // 10) != 0:
-                continue  # Skip some intermediate points if too many
             icon = folium.Icon(color='blue', icon='ship', prefix='fa')
             popup_content = f"🔵 <b>POSITION</b><br>" + popup_content
         
@@ -160,8 +377,8 @@ def create_map(ais_data, save_path="ais_map.html"):
         ).add_to(m)
     
     # Add map boundaries to fit all points
-    if len(path_coords) > 1:
-        m.fit_bounds(path_coords)
+    if len(coords) > 1:
+        m.fit_bounds([coords.min(axis=0).tolist(), coords.max(axis=0).tolist()])
     
     # Save map
     try:
@@ -227,7 +444,7 @@ def main():
         print()
         print("🎯 Map Features:")
         print("  🟢 Green marker = Start position")
-        print("  🔵 Blue markers = Intermediate positions") 
+        print("  🔵 Blue markers = Intermediate positions (clustered on long tracks)")
         print("  🔴 Red marker = End position")
         print("  📍 Click markers for detailed AIS info")
         print("  📏 Blue line shows ship's track")
@@ -3,21 +3,24 @@
 Quick demo script that generates AIS data and saves to JSON
 """
 
-import sys
-import os
 import requests
 import json
 from time import sleep
 
-sys.path.append(os.path.dirname(__file__))
 
 def main():
+    # One session for all calls so the connection to the server is reused
+    with requests.Session() as session:
+        run_demo(session)
+
+
+def run_demo(session: requests.Session):
     print("🚢 AIS Generator Quick Demo - Hackathon 2025")
     print("=" * 50)
     
     # Check if server is running
     try:
-        response = requests.get("http://localhost:8000/health")
+        response = session.get("http://localhost:8000/health")
         if response.status_code == 200:
             print("✅ Server is running")
         else:
@@ -40,7 +43,7 @@ def main():
     }
     
     try:
-        response = requests.post(
+        response = session.post(
             "http://localhost:8000/generate-irish-sea-demo",
             json=demo_request
         )
@@ -70,7 +73,7 @@ def main():
     print("📂 Listing all output files...")
     
     try:
-        response = requests.get("http://localhost:8000/files")
+        response = session.get("http://localhost:8000/files")
         if response.status_code == 200:
             files_data = response.json()
             print(f"📁 Output directory: {files_data['output_directory']}")
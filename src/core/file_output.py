@@ -3,20 +3,96 @@
 import json
 import os
 import random
+import string
+import uuid
 from datetime import datetime
+from operator import itemgetter
 from typing import List, Dict, Any
 from pathlib import Path
 
 from .models import ShipState
 from ..generators.nmea_formatter import NMEAFormatter
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import map generation dependencies
 try:
     import folium
+    from folium.plugins import FastMarkerCluster
     FOLIUM_AVAILABLE = True
 except ImportError:
     FOLIUM_AVAILABLE = False
 
+# Map styling per ship type
+SHIP_COLOR_MAP = {
+    'PASSENGER': 'blue',
+    'CARGO': 'green',
+    'FISHING': 'orange', 
+    'PILOT_VESSEL': 'red',
+    'HIGH_SPEED_CRAFT': 'purple',
+    'LAW_ENFORCEMENT': 'darkred',
+    'SEARCH_RESCUE': 'cadetblue',
+}
+
+# Fallback color sequence if type not found
+FALLBACK_COLORS = ('blue', 'red', 'green', 'purple', 'orange', 'darkred', 'lightred', 'beige', 'darkblue', 'darkgreen')
+
+SHIP_ICON_MAP = {
+    'PASSENGER': 'ship',
+    'CARGO': 'cube', 
+    'FISHING': 'anchor',
+    'PILOT_VESSEL': 'shield',
+    'HIGH_SPEED_CRAFT': 'forward',
+    'LAW_ENFORCEMENT': 'star',
+    'SEARCH_RESCUE': 'plus',
+}
+
+# Leaflet callback drawing each clustered waypoint row [lat, lon, index] as a small circle
+WAYPOINT_CALLBACK_TEMPLATE = string.Template("""function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+                                {radius: 4, color: $color, fill: true, opacity: 0.6});
+    marker.bindPopup($label + row[2]);
+    return marker;
+}""")
+
+
+# Map overlay HTML, parsed once at import
+MAP_TITLE_TEMPLATE = string.Template("""
+            <div style='position: fixed; top: 10px; left: 50px; z-index: 1000; 
+                        background: white; padding: 10px; border: 2px solid black; border-radius: 5px;'>
+                <h3 style='margin: 0;'>🚢 $scenario_name</h3>
+                <p style='margin: 5px 0 0 0; font-size: 12px;'>
+                    Ships: $total_ships | 
+                    Generated: $generated_at
+                </p>
+            </div>
+            """)
+
+MAP_LEGEND_ITEM_TEMPLATE = string.Template("""
+                <div style='margin: 3px 0;'>
+                    <span style='display: inline-block; width: 15px; height: 15px; 
+                                background-color: $color; border: 1px solid black; margin-right: 8px;'></span>
+                    $ship_type
+                </div>
+            """)
+
+MAP_LEGEND_TEMPLATE = string.Template("""
+        <div style='position: fixed; bottom: 10px; left: 10px; z-index: 1000; 
+                    background: white; padding: 10px; border: 2px solid black; border-radius: 5px;
+                    font-family: Arial, sans-serif; font-size: 12px;'>
+            <h4 style='margin: 0 0 8px 0;'>🏷️ Ship Types</h4>
+            $items
+            <hr style='margin: 8px 0 5px 0;'>
+            <div style='font-size: 10px; color: #666;'>
+                🟢 Start | 🔴 End | ⚫ Waypoints
+            </div>
+        </div>
+        """)
+
 
 class FileOutputManager:
     """Manages file output for AIS data"""
@@ -77,46 +153,44 @@ class FileOutputManager:
                         "timestamp": ship_states[-1].timestamp.isoformat()
                     }
                 },
-                "ais_data": [self.formatter.create_ais_summary(state) for state in ship_states]
+                "ais_data": list(map(self.formatter.create_ais_summary, ship_states))
             }
             
-        with open(json_path, 'w') as f:
-            json.dump(json_data, f, indent=2)
-        
-        saved_files['json'] = str(json_path)
-        
-        # Generate interactive map if Folium is available
-        if FOLIUM_AVAILABLE:
-            try:
-                map_filename = f"{filename_prefix}_map_mmsi_{mmsi}_{timestamp}.html"
-                map_path = self.base_output_dir / map_filename
-                
-                # Generate the interactive map
-                map_created = self._generate_interactive_map(json_data, str(map_path))
-                if map_created:
-                    saved_files["map"] = str(map_path)
-            except Exception as e:
-                print(f"⚠️  Warning: Could not generate map - {e}")
+            self._write_json(json_path, json_data)
+            
+            saved_files['json'] = str(json_path)
+            
+            # Generate interactive map if Folium is available
+            if FOLIUM_AVAILABLE:
+                try:
+                    map_filename = f"{filename_prefix}_map_mmsi_{mmsi}_{timestamp}.html"
+                    map_path = self.base_output_dir / map_filename
+                    
+                    # Generate the interactive map
+                    map_created = self._generate_interactive_map(json_data, str(map_path))
+                    if map_created:
+                        saved_files["map"] = str(map_path)
+                except Exception as e:
+                    print(f"⚠️  Warning: Could not generate map - {e}")
         
         if format_type in ["nmea", "both"]:
             nmea_filename = f"{filename_prefix}_mmsi_{mmsi}_{timestamp}.nmea"
             nmea_path = self.base_output_dir / nmea_filename
             
-            # Convert ship states to NMEA sentences
-            nmea_lines = []
-            nmea_lines.append(f"# AIS/NMEA Data for {ship_states[0].ship_name} (MMSI: {mmsi})")
-            nmea_lines.append(f"# Generated: {datetime.utcnow().isoformat()}")
-            nmea_lines.append(f"# Total reports: {len(ship_states)}")
-            nmea_lines.append("")
-            
-            for i, state in enumerate(ship_states):
-                nmea_lines.append(f"# Report {i+1} - {state.timestamp.isoformat()}")
-                nmea_sentence = self.formatter.format_realistic_position_report(state)
-                nmea_lines.append(nmea_sentence)
-                nmea_lines.append("")
+            # Stream NMEA sentences to the file as they are formatted, one encoded
+            # chunk per report; lines end in CRLF like the sentences themselves
+            nmea_header = (
+                f"# AIS/NMEA Data for {ship_states[0].ship_name} (MMSI: {mmsi})\r\n"
+                f"# Generated: {datetime.utcnow().isoformat()}\r\n"
+                f"# Total reports: {len(ship_states)}\r\n"
+            )
+            nmea_sentences = self.formatter.iter_realistic_position_reports(ship_states)
             
-            with open(nmea_path, 'w') as f:
-                f.write("\\n".join(nmea_lines))
+            with open(nmea_path, 'wb') as f:
+                f.write(nmea_header.encode('utf-8'))
+                for i, (state, nmea_sentence) in enumerate(zip(ship_states, nmea_sentences)):
+                    f.write(f"\r\n# Report {i+1} - {state.timestamp.isoformat()}\r\n"
+                            f"{nmea_sentence}\r\n".encode('utf-8'))
             
             saved_files['nmea'] = str(nmea_path)
         
@@ -153,9 +227,11 @@ class FileOutputManager:
             "ships": {}
         }
         
+        ships = json_data["ships"]
+        create_summary = self.formatter.create_ais_summary
         for mmsi, ship_states in ships_data.items():
             if ship_states:
-                json_data["ships"][str(mmsi)] = {
+                ships[str(mmsi)] = {
                     "ship_info": {
                         "mmsi": mmsi,
                         "ship_name": ship_states[0].ship_name,
@@ -174,11 +250,10 @@ class FileOutputManager:
                             "timestamp": ship_states[-1].timestamp.isoformat()
                         }
                     },
-                    "ais_data": [self.formatter.create_ais_summary(state) for state in ship_states]
+                    "ais_data": list(map(create_summary, ship_states))
                 }
         
-        with open(json_path, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        self._write_json(json_path, json_data)
         
         saved_files = {"json": str(json_path)}
         
@@ -197,6 +272,31 @@ class FileOutputManager:
         
         return saved_files
     
+    def _write_json(self, json_path: Path, json_data: Dict[str, Any]) -> None:
+        """Write JSON with 2-space indentation, serialized in one pass by orjson when available"""
+        if ORJSON_AVAILABLE:
+            self._atomic_write_bytes(json_path, orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+        else:
+            self._atomic_write_bytes(json_path, json.dumps(json_data, indent=2).encode('utf-8'))
+    
+    def _atomic_write_bytes(self, path: Path, data: bytes) -> None:
+        """Write bytes to a temporary sibling and rename it over path, so readers never see a partial file"""
+        # A unique temp name per call keeps concurrent writers of the same path apart;
+        # O_EXCL refuses to reuse an existing file and mode 0o666 lets the kernel apply the umask
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        fd = os.open(tmp_path, flags, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        except BaseException:
+            os.close(fd)
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.close(fd)
+        os.replace(tmp_path, path)
+    
     def _calculate_duration(self, ship_states: List[ShipState]) -> float:
         """Calculate duration in hours between first and last report"""
         if len(ship_states) < 2:
@@ -215,18 +315,21 @@ class FileOutputManager:
         if not self.base_output_dir.exists():
             return files
         
-        for file_path in self.base_output_dir.iterdir():
-            if file_path.is_file():
-                stat = file_path.stat()
-                files.append({
-                    "filename": file_path.name,
-                    "full_path": str(file_path),
-                    "size_bytes": stat.st_size,
-                    "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "extension": file_path.suffix
-                })
+        # scandir reuses the directory read for the file-type check
+        with os.scandir(self.base_output_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append({
+                        "filename": entry.name,
+                        "full_path": entry.path,
+                        "size_bytes": stat.st_size,
+                        "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                        "extension": os.path.splitext(entry.name)[1]
+                    })
         
-        return sorted(files, key=lambda x: x["modified_at"], reverse=True)
+        files.sort(key=itemgetter("modified_at"), reverse=True)
+        return files
     
     def _generate_interactive_map(self, json_data: Dict[str, Any], map_path: str) -> bool:
         """Generate interactive HTML map from ship data"""
@@ -246,18 +349,27 @@ class FileOutputManager:
             if not ships_data:
                 return False
             
-            # Calculate map center from all ship positions
-            all_lats, all_lons = [], []
-            for ship_id, ship_info in ships_data.items():
-                if 'ais_data' in ship_info:
-                    for report in ship_info['ais_data']:
-                        if 'position' in report:
-                            all_lats.append(report['position']['latitude'])
-                            all_lons.append(report['position']['longitude'])
+            # Extract each ship's route once; reused for the map center and the route lines
+            ship_positions = {
+                ship_id: [
+                    [report['position']['latitude'], report['position']['longitude']]
+                    for report in ship_info['ais_data'] if 'position' in report
+                ]
+                for ship_id, ship_info in ships_data.items() if 'ais_data' in ship_info
+            }
             
-            if not all_lats or not all_lons:
+            # Only ships with a drawable route (two or more positions) go on the map;
+            # bail out before building the base map when there are none
+            plottable = {
+                ship_id: positions for ship_id, positions in ship_positions.items() if len(positions) >= 2
+            }
+            if not plottable:
                 return False
             
+            all_positions = [pos for positions in plottable.values() for pos in positions]
+            
+            # Calculate map center from plotted ship positions (transpose and sums run in C)
+            all_lats, all_lons = zip(*all_positions)
             center_lat = sum(all_lats) / len(all_lats)
             center_lon = sum(all_lons) / len(all_lons)
             
@@ -268,30 +380,23 @@ class FileOutputManager:
                 tiles='OpenStreetMap'
             )
             
+            # Color and icon per ship type, resolved once and shared with the legend
+            ship_types = {
+                ship_id: ships_data[ship_id]['ais_data'][0].get('ship_type', 'UNKNOWN') for ship_id in plottable
+            }
+            type_styles = {
+                ship_type: (self._get_ship_color(ship_type, i), self._get_ship_icon(ship_type))
+                for i, ship_type in enumerate(sorted(set(ship_types.values())))
+            }
+            
             # Add ships to map
-            ship_index = 0
-            for ship_id, ship_info in ships_data.items():
-                if 'ais_data' not in ship_info or not ship_info['ais_data']:
-                    continue
+            for ship_id, positions in plottable.items():
+                ship_info = ships_data[ship_id]
                 
                 # Get ship details
                 ship_name = ship_info.get('ship_info', {}).get('ship_name', f'Ship_{ship_id}')
-                ship_type = ship_info.get('ais_data', [{}])[0].get('ship_type', 'UNKNOWN')
-                
-                # Get color and icon for ship type
-                color = self._get_ship_color(ship_type, ship_index)
-                icon = self._get_ship_icon(ship_type)
-                
-                # Extract positions for route line
-                positions = []
-                for report in ship_info['ais_data']:
-                    if 'position' in report:
-                        lat = report['position']['latitude']
-                        lon = report['position']['longitude']
-                        positions.append([lat, lon])
-                
-                if len(positions) < 2:
-                    continue
+                ship_type = ship_types[ship_id]
+                color, icon = type_styles[ship_type]
                 
                 # Add route line
                 folium.PolyLine(
@@ -343,39 +448,29 @@ class FileOutputManager:
                     tooltip=f"{ship_name} - END"
                 ).add_to(m)
                 
-                # Add intermediate waypoints as small circles
+                # Add intermediate waypoints as small circles, shipped to the page as one JS array
                 if len(positions) > 2:
-                    for i, pos in enumerate(positions[1:-1], 1):
-                        folium.CircleMarker(
-                            pos,
-                            radius=4,
-                            popup=f"{ship_name} - Waypoint {i}",
-                            color=color,
-                            fill=True,
-                            opacity=0.6
-                        ).add_to(m)
-                
-                ship_index += 1
+                    waypoints = [[lat, lon, i] for i, (lat, lon) in enumerate(positions[1:-1], 1)]
+                    callback = WAYPOINT_CALLBACK_TEMPLATE.substitute(
+                        color=json.dumps(color),
+                        label=json.dumps(f"{ship_name} - Waypoint ").replace("</", "<\\/")
+                    )
+                    FastMarkerCluster(waypoints, callback=callback).add_to(m)
             
             # Add legend
-            legend_html = self._generate_map_legend(ships_data)
+            legend_html = self._generate_map_legend(type_styles)
             m.get_root().html.add_child(folium.Element(legend_html))
             
             # Add title
-            title_html = f"""
-            <div style='position: fixed; top: 10px; left: 50px; z-index: 1000; 
-                        background: white; padding: 10px; border: 2px solid black; border-radius: 5px;'>
-                <h3 style='margin: 0;'>🚢 {metadata.get('scenario_name', 'AIS Ship Tracking')}</h3>
-                <p style='margin: 5px 0 0 0; font-size: 12px;'>
-                    Ships: {metadata.get('total_ships', len(ships_data))} | 
-                    Generated: {metadata.get('generated_at', datetime.now().strftime('%Y-%m-%d %H:%M'))}
-                </p>
-            </div>
-            """
+            title_html = MAP_TITLE_TEMPLATE.substitute(
+                scenario_name=metadata.get('scenario_name', 'AIS Ship Tracking'),
+                total_ships=metadata.get('total_ships', len(ships_data)),
+                generated_at=metadata.get('generated_at', datetime.now().strftime('%Y-%m-%d %H:%M'))
+            )
             m.get_root().html.add_child(folium.Element(title_html))
             
-            # Save map
-            m.save(map_path)
+            # Save map (rendered in memory, then written in one go)
+            self._atomic_write_bytes(Path(map_path), m.get_root().render().encode('utf-8'))
             return True
             
         except Exception as e:
@@ -384,68 +479,19 @@ class FileOutputManager:
     
     def _get_ship_color(self, ship_type: str, ship_index: int) -> str:
         """Get color for ship based on type"""
-        color_map = {
-            'PASSENGER': 'blue',
-            'CARGO': 'green',
-            'FISHING': 'orange', 
-            'PILOT_VESSEL': 'red',
-            'HIGH_SPEED_CRAFT': 'purple',
-            'LAW_ENFORCEMENT': 'darkred',
-            'SEARCH_RESCUE': 'cadetblue',
-        }
-        
-        # Fallback color sequence if type not found
-        fallback_colors = ['blue', 'red', 'green', 'purple', 'orange', 'darkred', 'lightred', 'beige', 'darkblue', 'darkgreen']
-        
-        return color_map.get(ship_type, fallback_colors[ship_index % len(fallback_colors)])
+        return SHIP_COLOR_MAP.get(ship_type, FALLBACK_COLORS[ship_index % len(FALLBACK_COLORS)])
 
     def _get_ship_icon(self, ship_type: str) -> str:
         """Get icon for ship based on type"""
-        icon_map = {
-            'PASSENGER': 'ship',
-            'CARGO': 'cube', 
-            'FISHING': 'anchor',
-            'PILOT_VESSEL': 'shield',
-            'HIGH_SPEED_CRAFT': 'forward',
-            'LAW_ENFORCEMENT': 'star',
-            'SEARCH_RESCUE': 'plus',
-        }
-        
-        return icon_map.get(ship_type, 'ship')
+        return SHIP_ICON_MAP.get(ship_type, 'ship')
     
-    def _generate_map_legend(self, ships_data: Dict[str, Any]) -> str:
-        """Generate HTML legend for the map"""
-        ship_types = set()
-        for ship_info in ships_data.values():
-            if 'ais_data' in ship_info and ship_info['ais_data']:
-                ship_type = ship_info['ais_data'][0].get('ship_type', 'UNKNOWN')
-                ship_types.add(ship_type)
-        
-        legend_items = []
-        for i, ship_type in enumerate(sorted(ship_types)):
-            color = self._get_ship_color(ship_type, i)
-            legend_items.append(f"""
-                <div style='margin: 3px 0;'>
-                    <span style='display: inline-block; width: 15px; height: 15px; 
-                                background-color: {color}; border: 1px solid black; margin-right: 8px;'></span>
-                    {ship_type}
-                </div>
-            """)
-        
-        legend_html = f"""
-        <div style='position: fixed; bottom: 10px; left: 10px; z-index: 1000; 
-                    background: white; padding: 10px; border: 2px solid black; border-radius: 5px;
-                    font-family: Arial, sans-serif; font-size: 12px;'>
-            <h4 style='margin: 0 0 8px 0;'>🏷️ Ship Types</h4>
-            {''.join(legend_items)}
-            <hr style='margin: 8px 0 5px 0;'>
-            <div style='font-size: 10px; color: #666;'>
-                🟢 Start | 🔴 End | ⚫ Waypoints
-            </div>
-        </div>
-        """
-        
-        return legend_html
+    def _generate_map_legend(self, type_styles: Dict[str, tuple]) -> str:
+        """Generate HTML legend for the map from the per-type (color, icon) styles"""
+        items = "".join(
+            MAP_LEGEND_ITEM_TEMPLATE.substitute(color=color, ship_type=ship_type)
+            for ship_type, (color, _icon) in sorted(type_styles.items())
+        )
+        return MAP_LEGEND_TEMPLATE.substitute(items=items)
     
     def get_file_content(self, filename: str) -> str:
         """Get content of a file in the output directory"""
@@ -1,27 +1,57 @@
 """NMEA message formatter for AIS data"""
 
+import base64
 import math
 from datetime import datetime
-from typing import List
+from functools import reduce
+from operator import xor
+from typing import Iterator, List
 
-from ..core.models import ShipState
+from ..core.models import NavigationStatus, ShipState, ShipType
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# AIS six-bit armoring alphabet, indexed by 6-bit value ('0'-'W' then '`'-'w')
+SIXBIT_ASCII = "0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVW`abcdefghijklmnopqrstuvw"
+
+# Base64 also splits bytes into big-endian 6-bit groups, so remapping its
+# alphabet onto SIXBIT_ASCII armors a whole payload in C
+BASE64_TO_SIXBIT = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    SIXBIT_ASCII.encode("ascii")
+)
+
+# Enum member names resolved once; Enum.name is a descriptor lookup on every access
+NAVIGATION_STATUS_NAMES = {status: status.name for status in NavigationStatus}
+SHIP_TYPE_NAMES = {ship_type: ship_type.name for ship_type in ShipType}
+
+# AIS message type 1 field widths in bits, in message order: type, repeat, MMSI,
+# nav status, rate of turn, SOG, accuracy, lon, lat, COG, heading, second,
+# maneuver, spare, RAIM, radio status
+POSITION_REPORT_FIELD_WIDTHS = (6, 2, 30, 4, 8, 10, 1, 28, 27, 12, 9, 6, 2, 3, 1, 19)
+POSITION_REPORT_BITS = sum(POSITION_REPORT_FIELD_WIDTHS)  # 168 bits, 28 six-bit characters
+
+# GPS sentence bodies shared by the per-state and per-track formatters;
+# GGA and RMC carry the same position fields, formatted once per report
+POSITION_TEMPLATE = "{lat_deg:02d}{lat_min:07.4f},{lat_dir},{lon_deg:03d}{lon_min:07.4f},{lon_dir}"
+GGA_TEMPLATE = "GPGGA,{time},{position},1,08,1.0,10.0,M,0.0,M,,"
+RMC_TEMPLATE = "GPRMC,{time},A,{position},{speed:.1f},{course:.1f},{date},,"
 
 
 class NMEAFormatter:
     """Formats AIS data into NMEA 0183 sentences"""
     
     @staticmethod
-    def _encode_6bit(value: int, width: int) -> str:
-        """Encode integer value as 6-bit ASCII armoring"""
-        # AIS uses 6-bit encoding with character offset
-        chars = "0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
-        
-        result = ""
-        for i in range(width):
-            char_val = (value >> (6 * (width - 1 - i))) & 0x3F
-            result += chars[char_val]
-        
-        return result
+    def _encode_6bit(value: int, width: int) -> bytes:
+        """Encode integer value as 6-bit ASCII armoring (ASCII bytes)"""
+        # Pad to a whole number of 3-byte blocks so base64 emits no '=' padding
+        pad = -width % 4
+        raw = ((value & ((1 << (6 * width)) - 1)) << (6 * pad)).to_bytes((width + pad) * 3 // 4, "big")
+        return base64.b64encode(raw).translate(BASE64_TO_SIXBIT)[:width]
     
     @staticmethod
     def _latitude_to_ais(lat: float) -> int:
@@ -43,49 +73,77 @@ class NMEAFormatter:
         """Convert course in degrees to AIS format (1/10 degrees)"""
         return int(course_degrees * 10)
     
+    @staticmethod
+    def _time_and_date(timestamp: datetime) -> tuple:
+        """Return NMEA hhmmss and ddmmyy fields (plain field formatting is cheaper than strftime)"""
+        return (
+            f"{timestamp.hour:02d}{timestamp.minute:02d}{timestamp.second:02d}",
+            f"{timestamp.day:02d}{timestamp.month:02d}{timestamp.year % 100:02d}",
+        )
+    
     @staticmethod
     def _calculate_checksum(sentence: str) -> str:
         """Calculate NMEA checksum"""
-        checksum = 0
-        for char in sentence:
-            checksum ^= ord(char)
-        return f"{checksum:02X}"
+        return f"{reduce(xor, sentence.encode('ascii'), 0):02X}"
     
     def format_position_report(self, ship_state: ShipState, sequence_id: int = 0) -> str:
         """
         Format AIS message type 1 (Position Report Class A) as NMEA sentence
-        
-        This is a simplified version for demonstration purposes.
-        A production implementation would need full AIS bit-level encoding.
+
+        Fields are packed into a single 168-bit integer and armored as
+        28 six-bit characters. Rate of turn, maneuver indicator and RAIM
+        are reported as not available.
         """
         
-        # Create a simplified AIVDM sentence
-        # In reality, this would involve complex bit-level encoding
-        
         # Convert position to AIS format
         lat_ais = self._latitude_to_ais(ship_state.position.latitude)
         lon_ais = self._longitude_to_ais(ship_state.position.longitude)
-        speed_ais = self._speed_to_ais(ship_state.speed_over_ground)
-        course_ais = self._course_to_ais(ship_state.course_over_ground)
+        speed_ais = min(self._speed_to_ais(ship_state.speed_over_ground), 1022)
+        course_ais = min(self._course_to_ais(ship_state.course_over_ground), 3599)
+        heading = 511 if ship_state.heading is None else int(ship_state.heading) % 360
+        
+        # Values in POSITION_REPORT_FIELD_WIDTHS order; masking each value to its
+        # width yields two's complement for the signed longitude/latitude fields
+        values = (
+            1,                                        # message type
+            0,                                        # repeat indicator
+            ship_state.mmsi,
+            int(ship_state.navigation_status),
+            0x80,                                     # rate of turn not available
+            speed_ais,
+            0,                                        # position accuracy
+            lon_ais,
+            lat_ais,
+            course_ais,
+            heading,
+            ship_state.timestamp.second,
+            0,                                        # maneuver indicator
+            0,                                        # spare
+            0,                                        # RAIM
+            0,                                        # radio status
+        )
+        
+        packed = 0
+        for value, width in zip(values, POSITION_REPORT_FIELD_WIDTHS):
+            packed = (packed << width) | (value & ((1 << width) - 1))
         
-        # Simplified payload (in practice this would be properly bit-encoded)
-        # This is a mock payload for demonstration
-        payload = f"15MvEPH000G?tO`K>RA1wUbN0TKH"
+        payload = self._encode_6bit(packed, POSITION_REPORT_BITS // 6)
         
         # Create AIVDM sentence parts
         total_sentences = 1
         sentence_number = 1
         message_id = sequence_id % 10
-        channel = "A"
+        channel = b"A"
         
-        # Build sentence without checksum
-        sentence_core = f"AIVDM,{total_sentences},{sentence_number},{message_id},{channel},{payload},0"
+        # Build sentence without checksum; kept as bytes so the checksum
+        # reads the armored payload directly and only one decode happens
+        sentence_core = b"AIVDM,%d,%d,%d,%s,%s,0" % (total_sentences, sentence_number, message_id, channel, payload)
         
         # Calculate checksum
-        checksum = self._calculate_checksum(sentence_core)
+        checksum = reduce(xor, sentence_core, 0)
         
         # Complete NMEA sentence
-        nmea_sentence = f"!{sentence_core}*{checksum}"
+        nmea_sentence = f"!{sentence_core.decode('ascii')}*{checksum:02X}"
         
         return nmea_sentence
     
@@ -94,20 +152,62 @@ class NMEAFormatter:
         Format a more realistic NMEA sentence with actual position data
         (Still simplified, but includes real coordinates)
         """
-        timestamp = ship_state.timestamp.strftime("%H%M%S")
-        date = ship_state.timestamp.strftime("%d%m%y")
+        timestamp, date = self._time_and_date(ship_state.timestamp)
+        position = self._position_fields(ship_state.position.latitude, ship_state.position.longitude)
         
         # Create GPS-style position sentences that would accompany AIS
-        gga_sentence = self._create_gga_sentence(ship_state, timestamp)
-        rmc_sentence = self._create_rmc_sentence(ship_state, timestamp, date)
+        gga_sentence = self._create_gga_sentence(position, timestamp)
+        rmc_sentence = self._create_rmc_sentence(ship_state, position, timestamp, date)
         
-        return f"{gga_sentence}\\r\\n{rmc_sentence}"
+        return f"{gga_sentence}\r\n{rmc_sentence}"
     
-    def _create_gga_sentence(self, ship_state: ShipState, timestamp: str) -> str:
-        """Create GPGGA sentence (GPS Fix Data)"""
-        lat = ship_state.position.latitude
-        lon = ship_state.position.longitude
-        
+    def format_realistic_position_reports(self, ship_states: List[ShipState]) -> List[str]:
+        """Format realistic position reports for a whole track"""
+        return list(self.iter_realistic_position_reports(ship_states))
+    
+    def iter_realistic_position_reports(self, ship_states: List[ShipState]) -> Iterator[str]:
+        """
+        Yield realistic position reports for a whole track, one per state
+
+        Degree/minute conversion runs once over the track with NumPy instead
+        of per state; output matches format_realistic_position_report.
+        Sentences are produced lazily so callers can write them as they go.
+        """
+        if not NUMPY_AVAILABLE or not ship_states:
+            yield from map(self.format_realistic_position_report, ship_states)
+            return
+
+        count = len(ship_states)
+        lats = np.fromiter((state.position.latitude for state in ship_states), dtype=float, count=count)
+        lons = np.fromiter((state.position.longitude for state in ship_states), dtype=float, count=count)
+
+        abs_lats = np.abs(lats)
+        abs_lons = np.abs(lons)
+        lat_degs = abs_lats.astype(np.int64)
+        lon_degs = abs_lons.astype(np.int64)
+        lat_mins = (abs_lats - lat_degs) * 60
+        lon_mins = (abs_lons - lon_degs) * 60
+        lat_dirs = np.where(lats >= 0, "N", "S")
+        lon_dirs = np.where(lons >= 0, "E", "W")
+
+        for state, lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir in zip(
+            ship_states,
+            lat_degs.tolist(), lat_mins.tolist(), lat_dirs.tolist(),
+            lon_degs.tolist(), lon_mins.tolist(), lon_dirs.tolist()
+        ):
+            timestamp, date = self._time_and_date(state.timestamp)
+            position = POSITION_TEMPLATE.format(
+                lat_deg=lat_deg, lat_min=lat_min, lat_dir=lat_dir,
+                lon_deg=lon_deg, lon_min=lon_min, lon_dir=lon_dir
+            )
+            yield (
+                f"{self._create_gga_sentence(position, timestamp)}\r\n"
+                f"{self._create_rmc_sentence(state, position, timestamp, date)}"
+            )
+
+    @staticmethod
+    def _position_fields(lat: float, lon: float) -> str:
+        """Format latitude/longitude as NMEA ddmm.mmmm,N,dddmm.mmmm,E fields"""
         # Convert to degrees and minutes
         lat_deg = int(abs(lat))
         lat_min = (abs(lat) - lat_deg) * 60
@@ -117,28 +217,24 @@ class NMEAFormatter:
         lon_min = (abs(lon) - lon_deg) * 60
         lon_dir = "E" if lon >= 0 else "W"
         
-        sentence_core = f"GPGGA,{timestamp},{lat_deg:02d}{lat_min:07.4f},{lat_dir},{lon_deg:03d}{lon_min:07.4f},{lon_dir},1,08,1.0,10.0,M,0.0,M,,"
+        return POSITION_TEMPLATE.format(
+            lat_deg=lat_deg, lat_min=lat_min, lat_dir=lat_dir,
+            lon_deg=lon_deg, lon_min=lon_min, lon_dir=lon_dir
+        )
+    
+    def _create_gga_sentence(self, position: str, timestamp: str) -> str:
+        """Create GPGGA sentence (GPS Fix Data)"""
+        sentence_core = GGA_TEMPLATE.format(time=timestamp, position=position)
         checksum = self._calculate_checksum(sentence_core)
         
         return f"${sentence_core}*{checksum}"
     
-    def _create_rmc_sentence(self, ship_state: ShipState, timestamp: str, date: str) -> str:
+    def _create_rmc_sentence(self, ship_state: ShipState, position: str, timestamp: str, date: str) -> str:
         """Create GPRMC sentence (Recommended Minimum Navigation Information)"""
-        lat = ship_state.position.latitude
-        lon = ship_state.position.longitude
-        speed = ship_state.speed_over_ground
-        course = ship_state.course_over_ground
-        
-        # Convert to degrees and minutes
-        lat_deg = int(abs(lat))
-        lat_min = (abs(lat) - lat_deg) * 60
-        lat_dir = "N" if lat >= 0 else "S"
-        
-        lon_deg = int(abs(lon))
-        lon_min = (abs(lon) - lon_deg) * 60
-        lon_dir = "E" if lon >= 0 else "W"
-        
-        sentence_core = f"GPRMC,{timestamp},A,{lat_deg:02d}{lat_min:07.4f},{lat_dir},{lon_deg:03d}{lon_min:07.4f},{lon_dir},{speed:.1f},{course:.1f},{date},,"
+        sentence_core = RMC_TEMPLATE.format(
+            time=timestamp, position=position,
+            speed=ship_state.speed_over_ground, course=ship_state.course_over_ground, date=date
+        )
         checksum = self._calculate_checksum(sentence_core)
         
         return f"${sentence_core}*{checksum}"
@@ -155,8 +251,8 @@ class NMEAFormatter:
             "speed_knots": ship_state.speed_over_ground,
             "course_degrees": ship_state.course_over_ground,
             "heading_degrees": ship_state.heading,
-            "navigation_status": ship_state.navigation_status.name,
-            "ship_type": ship_state.ship_type.name,
+            "navigation_status": NAVIGATION_STATUS_NAMES[ship_state.navigation_status],
+            "ship_type": SHIP_TYPE_NAMES[ship_state.ship_type],
             "dimensions": {
                 "length": ship_state.length,
                 "width": ship_state.width,
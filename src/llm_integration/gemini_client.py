@@ -6,17 +6,32 @@ Uses Google's Gemini API with generous free tier
 import os
 import json
 import asyncio
-from typing import Dict, List, Any, Optional
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Any, Optional
 import google.generativeai as genai
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..mcp_integration.mcp_server import AISMCPServer
 
 
 class AISGeminiClient:
     """Gemini-based LLM client for processing natural language requests"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Number of recent messages kept in memory and replayed into the prompt
+    HISTORY_MAX_MESSAGES = 20
+    # Rotated chat logs kept beside log_path when logging is enabled
+    LOG_MAX_ROTATED = 5
+    # Default cap on concurrent Gemini requests (override with AIS_GEMINI_MAX_CONCURRENCY)
+    DEFAULT_MAX_CONCURRENCY = 8
+    
+    def __init__(self, api_key: Optional[str] = None, log_path: Optional[str] = None):
         self.api_key = api_key or os.getenv("GEMINI_KEY")
         if not self.api_key:
             raise ValueError("Gemini API key is required. Set GEMINI_KEY environment variable.")
@@ -26,7 +41,14 @@ class AISGeminiClient:
         self.model = genai.GenerativeModel('gemini-1.5-flash')
         
         self.mcp_server = AISMCPServer()
-        self.conversation_history = []
+        
+        # Lets batched requests run in parallel up to the account's rate limit
+        self.max_concurrency = self._max_concurrency_from_env()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.conversation_history = deque(maxlen=self.HISTORY_MAX_MESSAGES)
+        # Transcript logging is opt-in; keep it out of output/, which the API lists and serves
+        self.log_path = Path(log_path) if log_path else None
+        self._log_file = None
         
         # System prompt for Gemini
         self.system_context = """You are an expert maritime AIS (Automatic Identification System) data generator assistant.
@@ -67,6 +89,18 @@ User: "boats near Sicily" → Call generate_ais_data with location="near Sicily"
 Always mention that both JSON data and interactive HTML maps are automatically generated.
 """
 
+    def _max_concurrency_from_env(self) -> int:
+        """Read AIS_GEMINI_MAX_CONCURRENCY (a positive integer), falling back to the default"""
+        raw = os.getenv("AIS_GEMINI_MAX_CONCURRENCY")
+        if raw is None:
+            return self.DEFAULT_MAX_CONCURRENCY
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            print(f"⚠️  Warning: AIS_GEMINI_MAX_CONCURRENCY={raw!r} is not an integer, "
+                  f"using {self.DEFAULT_MAX_CONCURRENCY}")
+            return self.DEFAULT_MAX_CONCURRENCY
+    
     async def process_request(self, user_message: str) -> str:
         """Process a user request and return response"""
         
@@ -76,57 +110,140 @@ Always mention that both JSON data and interactive HTML maps are automatically g
             tool_call = self._determine_tool_call(user_message.lower())
             
             if tool_call:
-                tool_name, tool_args = tool_call
-                print(f"🔧 Calling tool: {tool_name}")
-                print(f"📝 Arguments: {tool_args}")
-                
-                # Call the MCP tool
-                tool_result = await self.mcp_server.call_tool(tool_name, tool_args)
+                response_text = await self._run_tool_call(tool_call)
+            else:
+                # No tools needed, direct conversation. The async call goes
+                # through the SDK's shared async client, so every turn reuses
+                # the same open connection instead of blocking the event loop
+                async with self._semaphore:
+                    response = await self.model.generate_content_async(self._build_prompt(user_message))
+                response_text = response.text
                 
-                # Check if tool execution was successful
-                if tool_result.get("success", False):
-                    # Return the successful result message directly
-                    success_message = tool_result.get("message", "✅ Data generated successfully!")
-                    
-                    # Add additional context about files generated
-                    files_info = ""
-                    if "saved_files" in tool_result:
-                        files_info = f"\n\n📁 **Generated Files:**"
-                        for file_type, file_path in tool_result["saved_files"].items():
-                            files_info += f"\n• {file_type.upper()}: {file_path}"
-                    
-                    # Add ship summary
-                    ships_info = ""
-                    if "ships" in tool_result and tool_result["ships"]:
-                        ships_info = f"\n\n🚢 **Generated Ships ({len(tool_result['ships'])}):**"
-                        for ship in tool_result["ships"][:3]:  # Show first 3 ships
-                            ships_info += f"\n• {ship.get('name', 'Unknown')} ({ship.get('type', 'Unknown type')}) - {ship.get('speed_knots', 0)} knots"
-                        if len(tool_result["ships"]) > 3:
-                            ships_info += f"\n• ... and {len(tool_result['ships']) - 3} more ships"
+        except Exception as e:
+            error_message = f"❌ Error processing request: {str(e)}"
+            print(error_message)
+            return error_message
+        
+        self._record_turn(user_message, response_text)
+        return response_text
+    
+    async def stream_request(self, user_message: str) -> AsyncIterator[str]:
+        """Process a user request, yielding the response text as it arrives
+        
+        Tool calls complete in one step and are yielded whole; direct
+        conversation is streamed from Gemini chunk by chunk.
+        """
+        try:
+            tool_call = self._determine_tool_call(user_message.lower())
+            
+            parts = []
+            if tool_call:
+                parts.append(await self._run_tool_call(tool_call))
+                yield parts[-1]
+            else:
+                async with self._semaphore:
+                    response = await self.model.generate_content_async(
+                        self._build_prompt(user_message),
+                        stream=True
+                    )
+                    async for chunk in response:
+                        parts.append(chunk.text)
+                        yield parts[-1]
                     
-                    return f"{success_message}{files_info}{ships_info}"
-                else:
-                    # Return error message
-                    error_msg = tool_result.get("error", "Unknown error occurred")
-                    return f"❌ **Error generating data:** {error_msg}"
-                
+        except Exception as e:
+            error_message = f"❌ Error processing request: {str(e)}"
+            print(error_message)
+            yield error_message
+            return
+        
+        self._record_turn(user_message, "".join(parts))
+    
+    def _record_turn(self, user_message: str, response_text: str):
+        """Remember a completed exchange and append it to the chat log, if enabled"""
+        timestamp = datetime.utcnow().isoformat()
+        messages = (
+            {"role": "user", "content": user_message, "timestamp": timestamp},
+            {"role": "assistant", "content": response_text, "timestamp": timestamp},
+        )
+        self.conversation_history.extend(messages)
+        
+        if self.log_path is None:
+            return
+        
+        try:
+            if self._log_file is None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._log_file = open(self.log_path, 'ab')
+            
+            if ORJSON_AVAILABLE:
+                lines = b"".join(orjson.dumps(message) + b"\n" for message in messages)
             else:
-                # No tools needed, direct conversation
-                prompt = f"""
+                lines = "".join(json.dumps(message, ensure_ascii=False) + "\n" for message in messages).encode("utf-8")
+            self._log_file.write(lines)
+            self._log_file.flush()
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write chat log - {e}")
+    
+    async def _run_tool_call(self, tool_call: tuple) -> str:
+        """Execute an MCP tool call and format the result for the user"""
+        tool_name, tool_args = tool_call
+        print(f"🔧 Calling tool: {tool_name}")
+        print(f"📝 Arguments: {tool_args}")
+        
+        # Call the MCP tool
+        tool_result = await self.mcp_server.call_tool(tool_name, tool_args)
+        
+        # Check if tool execution was successful
+        if tool_result.get("success", False):
+            # Return the successful result message directly
+            success_message = tool_result.get("message", "✅ Data generated successfully!")
+            
+            parts = [success_message]
+            
+            # Add additional context about files generated
+            if "saved_files" in tool_result:
+                parts.append("\n\n📁 **Generated Files:**")
+                parts.extend(
+                    f"\n• {file_type.upper()}: {file_path}"
+                    for file_type, file_path in tool_result["saved_files"].items()
+                )
+            
+            # Add ship summary
+            if "ships" in tool_result and tool_result["ships"]:
+                ships = tool_result["ships"]
+                parts.append(f"\n\n🚢 **Generated Ships ({len(ships)}):**")
+                parts.extend(  # Show first 3 ships
+                    f"\n• {ship.get('name', 'Unknown')} ({ship.get('type', 'Unknown type')}) - {ship.get('speed_knots', 0)} knots"
+                    for ship in ships[:3]
+                )
+                if len(ships) > 3:
+                    parts.append(f"\n• ... and {len(ships) - 3} more ships")
+            
+            return "".join(parts)
+        else:
+            # Return error message
+            error_msg = tool_result.get("error", "Unknown error occurred")
+            return f"❌ **Error generating data:** {error_msg}"
+    
+    def _build_prompt(self, user_message: str) -> str:
+        """Build the conversational prompt for requests that need no tools"""
+        return f"""
 {self.system_context}
-
+{self._format_history()}
 User request: {user_message}
 
 Please respond helpfully about AIS ship generation. If they're asking for information about capabilities, ports, or ship types, provide that information. If they want to generate ships, ask for clarification about what they need.
 """
-                
-                response = self.model.generate_content(prompt)
-                return response.text
-                
-        except Exception as e:
-            error_message = f"❌ Error processing request: {str(e)}"
-            print(error_message)
-            return error_message
+    
+    def _format_history(self) -> str:
+        """Format the recent conversation window for the prompt"""
+        if not self.conversation_history:
+            return ""
+        lines = "\n".join(
+            f"{'User' if message['role'] == 'user' else 'Assistant'}: {message['content']}"
+            for message in self.conversation_history
+        )
+        return f"\nRecent conversation:\n{lines}\n"
     
     def _determine_tool_call(self, user_message: str) -> Optional[tuple]:
         """Advanced pattern matching for sophisticated scenario generation"""
@@ -326,8 +443,30 @@ Please respond helpfully about AIS ship generation. If they're asking for inform
         return scenario
     
     def clear_conversation(self):
-        """Clear conversation history"""
-        self.conversation_history = []
+        """Clear conversation history and start a fresh chat log"""
+        self.conversation_history.clear()
+        
+        # Rotate the current log aside so the next turn starts a new file
+        self.close()
+        if self.log_path is None or not self.log_path.exists():
+            return
+        
+        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        self.log_path.rename(self.log_path.with_name(f"{self.log_path.stem}_{stamp}{self.log_path.suffix}"))
+        
+        # Keep only the newest LOG_MAX_ROTATED rotated logs (timestamped names sort by age)
+        rotated = sorted(self.log_path.parent.glob(f"{self.log_path.stem}_*{self.log_path.suffix}"))
+        for old_log in rotated[:-self.LOG_MAX_ROTATED]:
+            try:
+                old_log.unlink()
+            except OSError as e:
+                print(f"⚠️  Warning: Could not remove old chat log - {e}")
+    
+    def close(self):
+        """Close the chat log file"""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
     
     async def get_available_capabilities(self) -> str:
         """Get information about capabilities"""
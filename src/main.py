@@ -1,13 +1,19 @@
 """Main FastAPI application for AIS NMEA Data Generator"""
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import json
 import io
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .generators.ais_generator import AISGenerator, SimpleShipMovement
 from .generators.nmea_formatter import NMEAFormatter
 from .core.models import Position, Route
@@ -165,12 +171,9 @@ async def generate_data(ship_mmsi: int, request: GenerateRequest):
     
     elif request.output_format == "nmea":
         # Return NMEA sentences as text
-        nmea_lines = []
-        for i, state in enumerate(ship_states):
-            nmea_line = formatter.format_realistic_position_report(state)
-            nmea_lines.append(nmea_line)
+        nmea_lines = formatter.format_realistic_position_reports(ship_states)
         
-        nmea_content = "\\n".join(nmea_lines)
+        nmea_content = "\r\n".join(nmea_lines)
         
         # If we saved files, return info about them instead of streaming
         if saved_files:
@@ -190,12 +193,8 @@ async def generate_data(ship_mmsi: int, request: GenerateRequest):
     
     elif request.output_format == "both":
         # Return both formats
-        json_data = []
-        nmea_lines = []
-        
-        for i, state in enumerate(ship_states):
-            json_data.append(formatter.create_ais_summary(state))
-            nmea_lines.append(formatter.format_realistic_position_report(state))
+        json_data = [formatter.create_ais_summary(state) for state in ship_states]
+        nmea_lines = formatter.format_realistic_position_reports(ship_states)
         
         response = {
             "json_data": json_data,
@@ -272,12 +271,16 @@ async def get_file_content(filename: str):
         
         # Determine content type based on file extension
         if filename.endswith('.json'):
-            # Parse JSON and return as structured data
+            # Validate the JSON, then send the stored text as-is rather than
+            # parsing it into objects for FastAPI to encode all over again
             try:
-                json_content = json.loads(content)
-                return json_content
-            except json.JSONDecodeError:
+                if ORJSON_AVAILABLE:
+                    orjson.loads(content)
+                else:
+                    json.loads(content)
+            except ValueError:
                 return {"raw_content": content, "error": "Invalid JSON format"}
+            return Response(content=content, media_type="application/json")
         else:
             # Return as plain text
             return {"filename": filename, "content": content}
@@ -95,7 +95,7 @@ async def test_main_chat_interface():
         if setup_ok:
             # Test Gemini initialization
             print("🔄 Testing Gemini initialization...")
-            init_success = await cli.initialize_gemini()
+            init_success = await cli.initialize_llm()
             print(f"✅ Gemini initialization: {'Success' if init_success else 'Failed'}")
             
             if init_success and cli.llm_client:
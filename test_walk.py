@@ -19,13 +19,15 @@ def test_multi_ship_irish_sea():
     print("🚢🚢🚢 Testing AIS Generator - Walk Version (Multiple Ships)")
     print("=" * 70)
     
-    # Get number of ships from user
+    # Get number of ships from user (validated up front rather than via ValueError)
     try:
-        num_ships = int(input("How many ships would you like to generate? (1-10): "))
-        if not 1 <= num_ships <= 10:
-            print("Using default: 5 ships")
-            num_ships = 5
-    except (ValueError, KeyboardInterrupt):
+        answer = input("How many ships would you like to generate? (1-10): ").strip()
+    except KeyboardInterrupt:
+        answer = ""
+    
+    if answer.isdecimal() and 1 <= int(answer) <= 10:
+        num_ships = int(answer)
+    else:
         print("Using default: 5 ships")
         num_ships = 5
     